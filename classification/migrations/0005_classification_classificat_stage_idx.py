@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classification', '0004_alter_classification_observations_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classification',
+            index=models.Index(fields=['stage'], name='classificat_stage_idx'),
+        ),
+    ]
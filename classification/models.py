@@ -41,6 +41,10 @@ class Classification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Admin metrics group classifications by stage
+            models.Index(fields=['stage'], name='classificat_stage_idx'),
+        ]
         # Optional: Add unique constraint if each user can only classify an image once
         # unique_together = ['user', 'image']
     
@@ -4,9 +4,10 @@ import os
 import base64
 from io import BytesIO
 from PIL import Image as PILImage
-from django.test import TestCase, Client
+from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from users.views import generate_jwt_tokens
 from images.models import Image
 from classification.models import Classification
 
@@ -15,13 +16,13 @@ User = get_user_model()
 class ClassificationRoutesTestCase(TestCase):
     """Test cases for classification routes"""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Resolve route URLs once for the whole class"""
+        cls.classifications_url = reverse('classification:create_classification')
+    
     def setUp(self):
         """Set up test data"""
-        self.client = Client()
-        
-        # URLs
-        self.classifications_url = reverse('classification:create_classification')
-        
         # Create test users
         self.user = User.objects.create_user(
             email='classtest@example.com',
@@ -30,19 +31,8 @@ class ClassificationRoutesTestCase(TestCase):
             coren='123456',
         )
         
-        # Get authentication token
-        login_data = {
-            'email': 'classtest@example.com',
-            'password': 'testpass123'
-        }
-        
-        login_response = self.client.post(
-            reverse('users:login_user'),
-            data=json.dumps(login_data),
-            content_type='application/json'
-        )
-        
-        self.token = login_response.json()['token']
+        # Issue the token directly; login itself is covered by the users route tests
+        self.token, _ = generate_jwt_tokens(self.user)
         self.auth_headers = {'Authorization': f'Bearer {self.token}'}
         
         # Create test image
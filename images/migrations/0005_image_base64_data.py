@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-16 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0004_image_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='base64_data',
+            field=models.TextField(default=''),
+            preserve_default=False,
+        ),
+    ]
@@ -1,30 +1,29 @@
 import json
 import jwt
 import os
-import base64
-from io import BytesIO
-from PIL import Image as PILImage
-from django.test import TestCase, Client
+from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from users.views import generate_jwt_tokens
 from images.models import Image
 from classification.models import Classification
+from test_fixtures import TEST_JPEG_DATA_URL
 
 User = get_user_model()
 
 class ImageRoutesTestCase(TestCase):
     """Test cases for image upload and management routes"""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Resolve route URLs once for the whole class"""
+        cls.list_images_url = reverse('images:list_images')
+        cls.upload_batch_url = reverse('images:upload_batch')
+        cls.upload_single_url = reverse('images:upload_single')
+        cls.upload_with_stage_url = reverse('images:upload_with_stage')
+    
     def setUp(self):
         """Set up test data"""
-        self.client = Client()
-        
-        # URLs
-        self.list_images_url = reverse('images:list_images')
-        self.upload_batch_url = reverse('images:upload_batch')
-        self.upload_single_url = reverse('images:upload_single')
-        self.upload_with_stage_url = reverse('images:upload_with_stage')
-        
         # Create test users
         self.user = User.objects.create_user(
             email='imagetest@example.com',
@@ -35,19 +34,8 @@ class ImageRoutesTestCase(TestCase):
             institution='Test Hospital'
         )
         
-        # Get authentication token
-        login_data = {
-            'email': 'imagetest@example.com',
-            'password': 'testpass123'
-        }
-        
-        login_response = self.client.post(
-            reverse('users:login_user'),
-            data=json.dumps(login_data),
-            content_type='application/json'
-        )
-        
-        self.token = login_response.json()['token']
+        # Issue the token directly; login itself is covered by the users route tests
+        self.token, _ = generate_jwt_tokens(self.user)
         self.auth_headers = {'Authorization': f'Bearer {self.token}'}
         
         # Create test images
@@ -55,16 +43,8 @@ class ImageRoutesTestCase(TestCase):
         self.test_image_data_2 = self.create_test_image()
     
     def create_test_image(self):
-        """Create a test image in base64 format"""
-        # Create a simple test image
-        img = PILImage.new('RGB', (100, 100), color='red')
-        buffer = BytesIO()
-        img.save(buffer, format='JPEG')
-        img_data = buffer.getvalue()
-        
-        # Convert to base64
-        img_base64 = base64.b64encode(img_data).decode('utf-8')
-        return f"data:image/jpeg;base64,{img_base64}"
+        """Return the pre-encoded test JPEG as a base64 data URL"""
+        return TEST_JPEG_DATA_URL
     
     def test_list_images_success(self):
         """Test successful image listing"""
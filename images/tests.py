@@ -1,7 +1,9 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.conf import settings
 from images.models import Image
+import json
 
 User = get_user_model()
 
@@ -56,7 +58,8 @@ class ImageModelTest(TestCase):
         
         # Test accessing images from user (reverse relationship)
         user_images = self.user.uploaded_images.all()
-        self.assertEqual(user_images.count(), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(user_images.count(), 2)
         self.assertIn(image1, user_images)
         self.assertIn(image2, user_images)
     
@@ -96,12 +99,11 @@ class ImageModelTest(TestCase):
         # Test related manager methods
         uploaded_images = self.user.uploaded_images
         
-        # Test count
-        self.assertEqual(uploaded_images.count(), 2)
-        
-        # Test filter
-        jpg_images = uploaded_images.filter(file_path__endswith='.jpg')
-        self.assertEqual(jpg_images.count(), 2)
+        # Test count and filter, one query each
+        with self.assertNumQueries(2):
+            self.assertEqual(uploaded_images.count(), 2)
+            jpg_images = uploaded_images.filter(file_path__endswith='.jpg')
+            self.assertEqual(jpg_images.count(), 2)
         
         # Test exists
         self.assertTrue(uploaded_images.filter(id=image1.id).exists())
@@ -128,16 +130,14 @@ class ImageModelTest(TestCase):
 class ImageUserIntegrationTest(TestCase):
     """Integration tests for Image-User relationship"""
     
-    def setUp(self):
-        """Set up test users and images"""
-        self.user1 = User.objects.create_user(
-            email='user1@example.com',
-            password='pass1'
-        )
-        self.user2 = User.objects.create_user(
-            email='user2@example.com',
-            password='pass2'
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test users once, hashing a single shared password"""
+        password = make_password('testpass123')
+        cls.user1, cls.user2 = User.objects.bulk_create([
+            User(email='user1@example.com', password=password),
+            User(email='user2@example.com', password=password),
+        ])
     
     def test_multiple_users_multiple_images(self):
         """Test scenario with multiple users and their images"""
@@ -180,19 +180,12 @@ class ImageUserIntegrationTest(TestCase):
     
     def test_querying_images_by_user(self):
         """Test various ways to query images by user"""
-        # Create test data
-        Image.objects.create(
-            file_path='/uploads/test1.jpg',
-            uploaded_by=self.user1
-        )
-        Image.objects.create(
-            file_path='/uploads/test2.jpg',
-            uploaded_by=self.user1
-        )
-        Image.objects.create(
-            file_path='/uploads/other.jpg',
-            uploaded_by=self.user2
-        )
+        # Create test data in a single INSERT
+        Image.objects.bulk_create([
+            Image(file_path='/uploads/test1.jpg', uploaded_by=self.user1),
+            Image(file_path='/uploads/test2.jpg', uploaded_by=self.user1),
+            Image(file_path='/uploads/other.jpg', uploaded_by=self.user2),
+        ])
         
         # Query using foreign key
         user1_images_fk = Image.objects.filter(uploaded_by=self.user1)
@@ -207,3 +200,171 @@ class ImageUserIntegrationTest(TestCase):
             set(user1_images_fk.values_list('id', flat=True)),
             set(user1_images_related.values_list('id', flat=True))
         )
+
+
+class DecodeBase64BlocksTest(SimpleTestCase):
+    """Test the block-wise base64 decoder behind the upload views"""
+    
+    def decode(self, *blocks):
+        import io
+        from images.views import decode_base64_blocks
+        
+        destination = io.BytesIO()
+        file_hash, file_size = decode_base64_blocks(blocks, destination, 10 * 1024 * 1024)
+        return destination.getvalue()
+    
+    def test_trailing_newline_is_accepted(self):
+        """Test that unwrapped base64 followed by a newline decodes"""
+        import base64
+        
+        data = bytes(range(256)) * 12
+        encoded = base64.b64encode(data)
+        for suffix in (b'\n', b'\r\n'):
+            self.assertEqual(self.decode(encoded + suffix), data)
+            self.assertEqual(self.decode(encoded[:1000], encoded[1000:] + suffix), data)
+    
+    def test_leftover_characters_are_rejected(self):
+        """Test that an incomplete trailing group is still invalid"""
+        import base64
+        
+        encoded = base64.b64encode(b'image bytes!')
+        with self.assertRaises(ValueError):
+            self.decode(encoded + b'A\n')
+
+
+class JWTRequiredReuseTest(TestCase):
+    """Test the routed DRF image views behind the JWT middleware"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        from users.views import generate_jwt_tokens
+        
+        user = User.objects.create_user(email='reuse@example.com', password='reusepass123')
+        token, _ = generate_jwt_tokens(user)
+        cls.headers = {'Authorization': f'Bearer {token}'}
+    
+    def test_list_route_returns_id_and_url(self):
+        """Test that /images/ lists newest first as { id, url } with one query for the rows"""
+        from django.urls import reverse
+        
+        older = Image.objects.create(file_path='uploads/older.jpg')
+        newer = Image.objects.create(file_path='uploads/newer.jpg')
+        
+        # One query loads the user in the middleware, one reads the rows
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('images:list_images'), {'limit': 2}, headers=self.headers)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {'id': newer.id, 'url': f'{settings.MEDIA_URL}uploads/newer.jpg'},
+            {'id': older.id, 'url': f'{settings.MEDIA_URL}uploads/older.jpg'},
+        ])
+    
+    def test_upload_route_skips_second_verification(self):
+        """Test that a DRF upload view neither re-verifies the token nor re-queries the user"""
+        from unittest import mock
+        from django.urls import reverse
+        from images import views
+        
+        with mock.patch.object(views, 'verify_jwt_token', wraps=views.verify_jwt_token) as verify:
+            with self.assertNumQueries(1):
+                response = self.client.post(reverse('images:upload_batch'), headers=self.headers)
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'No image files provided')
+        verify.assert_not_called()
+
+
+class UploadWithStageSaveTest(TestCase):
+    """Test that upload_with_stage keeps nothing when its bulk inserts fail"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='stage@example.com', password='stagepass123')
+    
+    def setUp(self):
+        import tempfile
+        from unittest import mock
+        from django.test import override_settings
+        from images import views
+        
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.upload_dir = f'{media_root.name}/{settings.IMAGES_UPLOAD_DIR}'
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # The upload directory is resolved once per process
+        patcher = mock.patch.object(views, '_UPLOAD_DIR', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def post(self, user):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from images.views import upload_with_stage
+        
+        image = SimpleUploadedFile('stage.png', b'\x89PNG\r\n\x1a\n' + b'\x00' * 64, content_type='image/png')
+        request = APIRequestFactory().post('/images/upload/with-stage/?stage=stage1', {'images': [image]})
+        if user is not None:
+            force_authenticate(request, user=user)
+        return upload_with_stage(request)
+    
+    def stored_files(self):
+        import os
+        return os.listdir(self.upload_dir)
+    
+    def test_failed_classification_insert_rolls_back(self):
+        """Test that a failing classification insert removes the new image row and file"""
+        from unittest import mock
+        from classification.models import Classification
+        
+        with mock.patch.object(Classification.objects, 'bulk_create', side_effect=RuntimeError('boom')):
+            response = self.post(self.user)
+        
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(json.loads(response.content)['message'], 'Could not save the uploaded images')
+        self.assertFalse(Image.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+    
+    def test_anonymous_upload_leaves_no_file(self):
+        """Test that a file whose row cannot be built is discarded rather than moved into place"""
+        self.post(None)
+        
+        self.assertFalse(Image.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+
+class BulkCreateImagesTest(TestCase):
+    """Test that bulk_create_images tells our rows apart from rows raced in by another request"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='ours@example.com', password='ourspass123')
+        cls.other = User.objects.create_user(email='theirs@example.com', password='theirspass123')
+    
+    def image(self, file_hash, user, filename):
+        return Image(
+            file_path=f'images/{file_hash}.png',
+            file_hash=file_hash,
+            original_filename=filename,
+            file_size=64,
+            uploaded_by=user
+        )
+    
+    def test_raced_row_is_reported(self):
+        """Test that a hash another request stored first is returned as raced with its row"""
+        from images.views import bulk_create_images
+        
+        theirs = self.image('a' * 64, self.other, 'theirs.png')
+        theirs.save()
+        
+        stored, raced = bulk_create_images({
+            'a' * 64: self.image('a' * 64, self.user, 'ours.png'),
+            'b' * 64: self.image('b' * 64, self.user, 'new.png'),
+        })
+        
+        self.assertEqual(raced, {'a' * 64})
+        self.assertEqual(stored['a' * 64].id, theirs.id)
+        self.assertEqual(stored['b' * 64].uploaded_by_id, self.user.id)
+        self.assertEqual(bulk_create_images({}), ({}, set()))
@@ -12,6 +12,7 @@ urlpatterns = [
     # Base64 upload routes
     path('upload/base64/', views.upload_base64_image, name='upload_base64'),
     path('upload/base64/batch/', views.upload_batch_base64_images, name='upload_batch_base64'),
+    path('upload/base64/stream/', views.upload_base64_stream, name='upload_base64_stream'),
     path('upload/base64/with-classification/', views.upload_image_with_classification, name='upload_base64_with_classification'),
  
     path('<int:image_id>/', views.get_image_info, name='get_image_info'),
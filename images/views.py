@@ -1,28 +1,73 @@
 import os
 import hashlib
 import base64
-import io
+import binascii
+import mimetypes
+import posixpath
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from rest_framework.decorators import api_view, parser_classes, authentication_classes, permission_classes
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import AllowAny
 from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model
-from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import transaction
 from .models import Image
+from classification.models import Classification
+from skinrest.responses import OrjsonResponse
 import json
 import logging
 from functools import wraps
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Valid classification stages, built once for O(1) membership checks
+_VALID_CLASSIFICATIONS = frozenset(choice[0] for choice in Classification.CLASSIFICATION_CHOICES)
+
+# Image types accepted by the upload views (listed in error messages)
+ALLOWED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp')
+
+# Leading bytes of each accepted image type and the extension stored for it
+# (WebP is matched separately: 'RIFF' + 4 size bytes + 'WEBP')
+_IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'GIF87a', '.gif'),
+    (b'GIF89a', '.gif'),
+    (b'BM', '.bmp'),
+)
+
+# Upper bound on threads used to hash/stage files of a single batch request
+UPLOAD_MAX_WORKERS = 8
+
+# Read size when hashing uploads (Django's 64 KiB default means 16x more update() calls)
+HASH_CHUNK_SIZE = 1 << 20
+
+# Write buffer for streamed uploads (default 8 KiB means many small write() calls)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Read size for streamed base64 bodies (a multiple of 4 keeps blocks aligned to base64 quads)
+BASE64_STREAM_BLOCK_SIZE = 64 * 1024
+
+# Whitespace allowed (and ignored) inside a streamed base64 body
+_BASE64_WHITESPACE = b' \t\r\n'
+
 def verify_jwt_token(token):
     """
     Verify JWT token - import from users app
@@ -48,6 +93,15 @@ def jwt_required(f):
                 'error': 'Authorization header missing or invalid format'
             }, status=401)
         
+        # JWTAuthenticationMiddleware already verified this same header and
+        # loaded the user; reuse it instead of decoding and querying again.
+        # It is read from _jwt_user because DRF views without authentication
+        # classes overwrite request.user before this decorator runs.
+        user = getattr(getattr(request, '_request', request), '_jwt_user', None)
+        if user is not None:
+            request.user = user
+            return f(request, *args, **kwargs)
+        
         token = auth_header.split(' ')[1]
         user_id, error = verify_jwt_token(token)
         
@@ -57,9 +111,9 @@ def jwt_required(f):
                 'error': f'Authentication failed: {error}'
             }, status=401)
         
-        # Get user object
+        # Get user object (views only read id, email and name)
         try:
-            user = User.objects.get(id=user_id)
+            user = User.objects.only('id', 'email', 'name').get(id=user_id)
             request.user = user  # Add user to request
         except User.DoesNotExist:
             return JsonResponse({
@@ -72,44 +126,77 @@ def jwt_required(f):
 
 def calculate_file_hash_from_content(content):
     """Calculate SHA256 hash from file content (bytes)"""
-    hash_sha256 = hashlib.sha256()
-    hash_sha256.update(content)
-    return hash_sha256.hexdigest()
+    return hashlib.sha256(content).hexdigest()
+
+def estimate_base64_size(base64_string):
+    """
+    Upper bound of the decoded size of base64 data, computed without decoding it
+    """
+    data_length = len(base64_string)
+    if base64_string.startswith('data:'):
+        data_length -= base64_string.find(',', 0, 256) + 1
+    return data_length * 3 // 4 - base64_string[-2:].count('=')
 
-def decode_base64_image(base64_string, filename=None):
+def decode_base64_bytes(base64_string):
     """
-    Decode base64 image and return file-like object
+    Decode base64 image data and return the raw bytes (None if invalid)
     """
     try:
         # Remove data URL prefix if present (data:image/jpeg;base64,)
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        # Decode base64
-        image_data = base64.b64decode(base64_string)
-        
-        # Create file-like object
-        image_file = io.BytesIO(image_data)
-        
-        # Create InMemoryUploadedFile
-        if not filename:
-            filename = 'uploaded_image.jpg'
+        prefix, separator, payload = base64_string.partition(',')
+        if separator:
+            base64_string = payload
         
-        uploaded_file = InMemoryUploadedFile(
-            image_file, None, filename, 'image/jpeg', len(image_data), None
-        )
-        
-        return uploaded_file, len(image_data)
+        b64decode = pybase64.b64decode if PYBASE64_AVAILABLE else base64.b64decode
+        try:
+            # Strict decoding lets pybase64 use its SIMD fast path
+            return b64decode(base64_string, validate=True)
+        except binascii.Error:
+            # Line-wrapped payloads are still accepted, at scalar speed
+            return b64decode(base64_string)
     except Exception as e:
         logger.error(f"Base64 decode error: {str(e)}")
+        return None
+
+def decode_base64_image(base64_string):
+    """
+    Decode base64 image and return (content_bytes, size), or (None, 0) if invalid.
+    Wrap the bytes in a ContentFile if a Django file object is needed.
+    """
+    image_data = decode_base64_bytes(base64_string)
+    if image_data is None:
         return None, 0
+    return image_data, len(image_data)
+
+def sniff_image_extension(file):
+    """
+    Detect the image type of an uploaded file from its first bytes instead of
+    trusting the client's filename. Returns the extension to store it under,
+    or None if it is not a supported image.
+    """
+    file.seek(0)
+    header = file.read(12)
+    file.seek(0)
+    
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return '.webp'
+    for signature, extension in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    return None
+
+def get_file_extension(filename):
+    """Lower-cased extension of filename including the dot ('' if it has none)"""
+    _, dot, extension = filename.rpartition('.')
+    return f".{extension.lower()}" if dot else ''
 
-def save_image_from_content(content, file_hash, original_filename):
+def save_image_from_content(content, file_hash, original_filename, file_extension=None):
     """Save image content directly to disk"""
     upload_dir = ensure_upload_directory()
     
-    # Get file extension from original filename
-    file_extension = os.path.splitext(original_filename)[1].lower()
+    # Get file extension from original filename unless the caller already did
+    if file_extension is None:
+        file_extension = get_file_extension(original_filename)
     if not file_extension:
         file_extension = '.jpg'  # Default extension
     
@@ -117,8 +204,8 @@ def save_image_from_content(content, file_hash, original_filename):
     filename = f"{file_hash}{file_extension}"
     file_path = os.path.join(upload_dir, filename)
     
-    # Save file to disk
-    with open(file_path, 'wb') as destination:
+    # Save file to disk; content is already in memory so write it unbuffered in one call
+    with open(file_path, 'wb', buffering=0) as destination:
         destination.write(content)
     
     # Return relative path for database storage
@@ -128,34 +215,275 @@ def save_image_from_content(content, file_hash, original_filename):
 def calculate_file_hash(file):
     """Calculate SHA256 hash of a file"""
     hash_sha256 = hashlib.sha256()
-    for chunk in file.chunks():
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
         hash_sha256.update(chunk)
     return hash_sha256.hexdigest()
 
+_UPLOAD_DIR = None
+
 def ensure_upload_directory():
-    """Ensure the upload directory exists, create if it doesn't"""
-    upload_dir = os.path.join(settings.MEDIA_ROOT, settings.IMAGES_UPLOAD_DIR)
-    if not os.path.exists(upload_dir):
-        os.makedirs(upload_dir)
-        logger.info(f"Created upload directory: {upload_dir}")
-    return upload_dir
+    """Ensure the upload directory exists, create if it doesn't (resolved once per process)"""
+    global _UPLOAD_DIR
+    if _UPLOAD_DIR is None:
+        upload_dir = os.path.join(settings.MEDIA_ROOT, settings.IMAGES_UPLOAD_DIR)
+        os.makedirs(upload_dir, exist_ok=True)
+        _UPLOAD_DIR = upload_dir
+    return _UPLOAD_DIR
 
-def save_uploaded_file(file, file_hash):
+def save_uploaded_file(file, file_hash, file_extension=None):
     upload_dir = ensure_upload_directory()
     
-    original_name = file.name
-    file_extension = os.path.splitext(original_name)[1].lower()
+    if file_extension is None:
+        file_extension = get_file_extension(file.name)
     
     filename = f"{file_hash}{file_extension}"
     file_path = os.path.join(upload_dir, filename)
     
-    with open(file_path, 'wb+') as destination:
+    with open(file_path, 'wb+', buffering=WRITE_BUFFER_SIZE) as destination:
         for chunk in file.chunks():
             destination.write(chunk)
 
     relative_path = os.path.join(settings.IMAGES_UPLOAD_DIR, filename)
     return relative_path
 
+class StagedUploadedFile(UploadedFile):
+    """
+    Uploaded file written to a staging file in the upload directory and hashed
+    while it was received (see StagingUploadHandler)
+    """
+    
+    def __init__(self, name, content_type, size, charset, content_type_extra=None):
+        file = tempfile.NamedTemporaryFile(dir=ensure_upload_directory(), suffix='.part')
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+        self.file_hash = None
+    
+    def temporary_file_path(self):
+        return self.file.name
+    
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            # The staging file was already moved into place or discarded
+            pass
+
+class StagingUploadHandler(FileUploadHandler):
+    """
+    Upload handler that hashes each file and writes it into the upload
+    directory as its chunks arrive, so views neither re-read nor copy it.
+    Staging files the view does not keep are removed when the request closes.
+    """
+    chunk_size = HASH_CHUNK_SIZE
+    
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = StagedUploadedFile(
+            self.file_name, self.content_type, 0, self.charset, self.content_type_extra
+        )
+        self.hash_sha256 = hashlib.sha256()
+    
+    def receive_data_chunk(self, raw_data, start):
+        self.hash_sha256.update(raw_data)
+        self.file.write(raw_data)
+    
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.file_hash = self.hash_sha256.hexdigest()
+        return self.file
+    
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.file.close()
+
+def use_staging_upload_handler(request):
+    """Receive multipart files through StagingUploadHandler (call before request.FILES)"""
+    django_request = getattr(request, '_request', request)
+    django_request.upload_handlers = [StagingUploadHandler(django_request)]
+
+def hash_and_stage(file):
+    """
+    Hash an uploaded file while streaming it to a temporary file in the
+    upload directory. Returns (file_hash, tmp_path).
+    """
+    # Files received through StagingUploadHandler are already hashed and staged
+    if getattr(file, 'file_hash', None):
+        return file.file_hash, file.temporary_file_path()
+    
+    upload_dir = ensure_upload_directory()
+    hash_sha256 = hashlib.sha256()
+    
+    # Uploads Django already spooled to disk on the same filesystem are hashed
+    # in place and renamed into the upload directory instead of being rewritten
+    if hasattr(file, 'temporary_file_path'):
+        source_path = file.temporary_file_path()
+        if os.stat(source_path).st_dev == os.stat(upload_dir).st_dev:
+            for chunk in file.chunks(HASH_CHUNK_SIZE):
+                hash_sha256.update(chunk)
+            fd, tmp_path = tempfile.mkstemp(dir=upload_dir, suffix='.part')
+            os.close(fd)
+            os.replace(source_path, tmp_path)
+            return hash_sha256.hexdigest(), tmp_path
+    
+    with tempfile.NamedTemporaryFile(
+        dir=upload_dir, suffix='.part', delete=False, buffering=WRITE_BUFFER_SIZE
+    ) as destination:
+        try:
+            for chunk in file.chunks(HASH_CHUNK_SIZE):
+                hash_sha256.update(chunk)
+                destination.write(chunk)
+        except Exception:
+            destination.close()
+            os.unlink(destination.name)
+            raise
+    return hash_sha256.hexdigest(), destination.name
+
+def save_staged_file(tmp_path, file_hash, file_extension):
+    """Move a staged temporary file to its final hash-based name"""
+    filename = f"{file_hash}{file_extension}"
+    os.replace(tmp_path, os.path.join(ensure_upload_directory(), filename))
+    return os.path.join(settings.IMAGES_UPLOAD_DIR, filename)
+
+def discard_staged_file(tmp_path):
+    """Remove a staged temporary file that is no longer needed"""
+    try:
+        os.unlink(tmp_path)
+    except FileNotFoundError:
+        pass
+
+def stream_decode_base64(stream, destination, max_size):
+    """
+    Decode a base64 body read from stream in fixed-size blocks, hashing and
+    writing the decoded bytes as they are produced.
+    Returns (file_hash, file_size); raises ValueError on invalid or oversized data.
+    """
+    blocks = iter(lambda: stream.read(BASE64_STREAM_BLOCK_SIZE), b'')
+    return decode_base64_blocks(blocks, destination, max_size)
+
+def decode_base64_blocks(blocks, destination, max_size):
+    """
+    Decode an iterable of base64 byte blocks, hashing and writing the decoded
+    bytes as they are produced.
+    Returns (file_hash, file_size); raises ValueError on invalid or oversized data.
+    """
+    b64decode = pybase64.b64decode if PYBASE64_AVAILABLE else base64.b64decode
+    hash_sha256 = hashlib.sha256()
+    file_size = 0
+    pending = b''
+    first_block = True
+    
+    for block in blocks:
+        # Remove data URL prefix if present (data:image/jpeg;base64,)
+        if first_block:
+            first_block = False
+            if block.startswith(b'data:'):
+                _, separator, block = block.partition(b',')
+                if not separator:
+                    raise ValueError('Invalid base64 image data')
+        
+        # Only decode complete 4-character groups, carry the rest to the next block
+        block = pending + block
+        aligned = len(block) - len(block) % 4
+        
+        try:
+            raw = b64decode(block[:aligned], validate=True)
+        except ValueError:
+            # Whitespace (line-wrapped base64) is only stripped when the fast path
+            # rejects the block, since scanning for it costs more than decoding
+            block = block.translate(None, _BASE64_WHITESPACE)
+            aligned = len(block) - len(block) % 4
+            try:
+                raw = b64decode(block[:aligned], validate=True)
+            except ValueError:
+                raise ValueError('Invalid base64 image data')
+        pending = block[aligned:]
+        
+        file_size += len(raw)
+        if file_size > max_size:
+            raise ValueError('File too large. Maximum size is 10MB')
+        
+        hash_sha256.update(raw)
+        destination.write(raw)
+    
+    # A trailing newline after unwrapped base64 is left over without ever
+    # failing the fast path, so drop whitespace from the remainder as well
+    pending = pending.translate(None, _BASE64_WHITESPACE)
+    if pending or file_size == 0:
+        raise ValueError('Invalid base64 image data')
+    
+    return hash_sha256.hexdigest(), file_size
+
+def decode_hash_and_stage(base64_string, max_size):
+    """
+    Decode a base64 string block by block straight into a temporary file in the
+    upload directory, hashing as it goes (no full decoded copy is held in memory).
+    Returns (file_hash, tmp_path, file_size); raises ValueError on invalid or oversized data.
+    """
+    blocks = (
+        base64_string[start:start + BASE64_STREAM_BLOCK_SIZE].encode('ascii')
+        for start in range(0, len(base64_string), BASE64_STREAM_BLOCK_SIZE)
+    )
+    with tempfile.NamedTemporaryFile(
+        dir=ensure_upload_directory(), suffix='.part', delete=False, buffering=WRITE_BUFFER_SIZE
+    ) as destination:
+        try:
+            file_hash, file_size = decode_base64_blocks(blocks, destination, max_size)
+        except Exception:
+            destination.close()
+            os.unlink(destination.name)
+            raise
+    return file_hash, destination.name, file_size
+
+def bulk_create_images(new_images):
+    """
+    Insert new Image rows (keyed by file hash) in a single query. Rows another
+    request inserted concurrently are skipped by the unique file_hash constraint
+    instead of failing the batch. Returns (stored images keyed by file hash,
+    set of hashes whose stored row is another request's rather than ours).
+    """
+    if not new_images:
+        return {}, set()
+    Image.objects.bulk_create(new_images.values(), ignore_conflicts=True)
+    stored = Image.objects.in_bulk(list(new_images), field_name='file_hash')
+    raced = {
+        file_hash for file_hash, image in stored.items()
+        if (image.uploaded_by_id, image.original_filename, image.file_size) != (
+            new_images[file_hash].uploaded_by_id,
+            new_images[file_hash].original_filename,
+            new_images[file_hash].file_size,
+        )
+    }
+    return stored, raced
+
+def discard_unstored_images(new_images):
+    """
+    Remove the saved files of new images (keyed by file hash) whose rows were
+    rolled back, keeping files that a row of another request points to
+    """
+    if not new_images:
+        return
+    stored = set(
+        Image.objects.filter(file_hash__in=list(new_images)).values_list('file_hash', flat=True)
+    )
+    for file_hash, image in new_images.items():
+        if file_hash not in stored:
+            discard_staged_file(os.path.join(settings.MEDIA_ROOT, image.file_path))
+
+def run_in_upload_pool(func, items):
+    """
+    Run func(item) for every item on a bounded thread pool.
+    Returns a list of (result, exception) pairs in input order.
+    """
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_MAX_WORKERS, len(items))) as pool:
+        futures = [pool.submit(func, item) for item in items]
+    outcomes = []
+    for future in futures:
+        exc = future.exception()
+        outcomes.append((None if exc else future.result(), exc))
+    return outcomes
+
 @csrf_exempt
 @require_http_methods(["POST"])
 @jwt_required
@@ -167,27 +495,26 @@ def upload_image(request):
     try:
         # Check if image file was provided
         if 'image' not in request.FILES:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'No image file provided'
             }, status=400)
         
         uploaded_file = request.FILES['image']
         
-        # Validate file type (basic check)
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
-        file_extension = os.path.splitext(uploaded_file.name)[1].lower()
+        # Validate file type from its magic bytes
+        file_extension = sniff_image_extension(uploaded_file)
         
-        if file_extension not in allowed_extensions:
-            return JsonResponse({
+        if file_extension is None:
+            return OrjsonResponse({
                 'success': False,
-                'error': f'File type not allowed. Allowed types: {", ".join(allowed_extensions)}'
+                'error': f'File type not allowed. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'
             }, status=400)
         
         # Validate file size (max 10MB)
         max_size = 10 * 1024 * 1024  # 10MB
         if uploaded_file.size > max_size:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'File too large. Maximum size is 10MB'
             }, status=400)
@@ -198,7 +525,7 @@ def upload_image(request):
         # Check if image with this hash already exists
         existing_image = Image.objects.filter(file_hash=file_hash).first()
         if existing_image:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': True,
                 'message': 'Image already exists',
                 'image_id': existing_image.id,
@@ -206,7 +533,7 @@ def upload_image(request):
                 'duplicate': True
             })
         
-        file_path = save_uploaded_file(uploaded_file, file_hash)
+        file_path = save_uploaded_file(uploaded_file, file_hash, file_extension)
         
         image = Image.objects.create(
             file_path=file_path,
@@ -218,7 +545,7 @@ def upload_image(request):
         
         logger.info(f"Image uploaded successfully: {image.id} - {uploaded_file.name} by {request.user.email}")
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'message': 'Image uploaded successfully',
             'image_id': image.id,
@@ -226,121 +553,13 @@ def upload_image(request):
             'file_hash': image.file_hash,
             'original_filename': image.original_filename,
             'file_size': image.file_size,
-            'uploaded_at': image.uploaded_at.isoformat(),
+            'uploaded_at': image.uploaded_at,
             'duplicate': False
         })
         
     except Exception as e:
         logger.error(f"Error uploading image: {str(e)}")
-        return JsonResponse({
-            'success': False,
-            'error': 'Internal server error'
-        }, status=500)
-
-@csrf_exempt
-@require_http_methods(["POST"])
-@jwt_required
-def upload_batch_images(request):
-    """
-    Upload multiple images in batch
-    Expected: multipart/form-data with multiple 'images' fields
-    """
-    try:
-        # Get all image files
-        uploaded_files = request.FILES.getlist('images')
-        
-        if not uploaded_files:
-            return JsonResponse({
-                'success': False,
-                'error': 'No image files provided'
-            }, status=400)
-        
-        # Validate number of files (max 20 per batch)
-        if len(uploaded_files) > 20:
-            return JsonResponse({
-                'success': False,
-                'error': 'Too many files. Maximum 20 files per batch'
-            }, status=400)
-        
-        results = []
-        successful_uploads = 0
-        errors = []
-        
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
-        max_size = 10 * 1024 * 1024
-        
-        for i, uploaded_file in enumerate(uploaded_files):
-            try:
-                # Validate file type
-                file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-                if file_extension not in allowed_extensions:
-                    errors.append(f"File {i+1} ({uploaded_file.name}): Invalid file type")
-                    continue
-                
-                # Validate file size
-                if uploaded_file.size > max_size:
-                    errors.append(f"File {i+1} ({uploaded_file.name}): File too large (max 10MB)")
-                    continue
-                
-                # Calculate file hash
-                file_hash = calculate_file_hash(uploaded_file)
-                
-                # Check if image already exists
-                existing_image = Image.objects.filter(file_hash=file_hash).first()
-                if existing_image:
-                    results.append({
-                        'index': i + 1,
-                        'filename': uploaded_file.name,
-                        'status': 'duplicate',
-                        'message': 'Image already exists',
-                        'image_id': existing_image.id,
-                        'file_path': existing_image.file_path
-                    })
-                    continue
-                
-                # Save file to disk
-                file_path = save_uploaded_file(uploaded_file, file_hash)
-                
-                # Create database record
-                image = Image.objects.create(
-                    file_path=file_path,
-                    file_hash=file_hash,
-                    original_filename=uploaded_file.name,
-                    file_size=uploaded_file.size,
-                    uploaded_by=request.user
-                )
-                
-                results.append({
-                    'index': i + 1,
-                    'filename': uploaded_file.name,
-                    'status': 'success',
-                    'message': 'Image uploaded successfully',
-                    'image_id': image.id,
-                    'file_path': image.file_path,
-                    'file_hash': image.file_hash,
-                    'file_size': image.file_size,
-                    'uploaded_at': image.uploaded_at.isoformat()
-                })
-                
-                successful_uploads += 1
-                
-            except Exception as e:
-                errors.append(f"File {i+1} ({uploaded_file.name}): {str(e)}")
-        
-        logger.info(f"Batch upload completed: {successful_uploads} successful, {len(errors)} errors by {request.user.email}")
-        
-        return JsonResponse({
-            'success': True,
-            'message': f'Batch upload completed: {successful_uploads}/{len(uploaded_files)} files processed',
-            'results': results,
-            'successful_uploads': successful_uploads,
-            'total_files': len(uploaded_files),
-            'errors': errors
-        })
-        
-    except Exception as e:
-        logger.error(f"Error in batch upload: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Internal server error'
         }, status=500)
@@ -362,31 +581,29 @@ def upload_base64_image(request):
         filename = data.get('filename', 'uploaded_image.jpg')
         
         if not base64_data:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'No base64 image data provided'
             }, status=400)
         
-        # Decode base64 image
-        uploaded_file, file_size = decode_base64_image(base64_data, filename)
-        
-        if not uploaded_file:
-            return JsonResponse({
+        # Validate file size (max 10MB) before paying for the decode
+        max_size = 10 * 1024 * 1024  # 10MB
+        if estimate_base64_size(base64_data) > max_size:
+            return OrjsonResponse({
                 'success': False,
-                'error': 'Invalid base64 image data'
+                'error': 'File too large. Maximum size is 10MB'
             }, status=400)
         
-        # Validate file size (max 10MB)
-        max_size = 10 * 1024 * 1024  # 10MB
-        if file_size > max_size:
-            return JsonResponse({
+        # Decode base64 image
+        image_content = decode_base64_bytes(base64_data)
+        
+        if image_content is None:
+            return OrjsonResponse({
                 'success': False,
-                'error': 'File too large. Maximum size is 10MB'
+                'error': 'Invalid base64 image data'
             }, status=400)
         
-        # Get image content for hash calculation
-        uploaded_file.seek(0)
-        image_content = uploaded_file.read()
+        file_size = len(image_content)
         
         # Calculate file hash
         file_hash = calculate_file_hash_from_content(image_content)
@@ -394,7 +611,7 @@ def upload_base64_image(request):
         # Check if image already exists
         existing_image = Image.objects.filter(file_hash=file_hash).first()
         if existing_image:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': True,
                 'message': 'Image already exists',
                 'image_id': existing_image.id,
@@ -416,7 +633,7 @@ def upload_base64_image(request):
         
         logger.info(f"Base64 image uploaded successfully: {image.id} - {filename} by {request.user.email}")
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'message': 'Base64 image uploaded successfully',
             'image_id': image.id,
@@ -424,18 +641,113 @@ def upload_base64_image(request):
             'file_hash': image.file_hash,
             'original_filename': image.original_filename,
             'file_size': image.file_size,
-            'uploaded_at': image.uploaded_at.isoformat(),
+            'uploaded_at': image.uploaded_at,
             'duplicate': False
         })
         
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
         logger.error(f"Error uploading base64 image: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
+            'success': False,
+            'error': 'Internal server error'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@jwt_required
+def upload_base64_stream(request):
+    """
+    Upload a large image as a streamed base64 body (requires JWT authentication)
+    Expected: text/plain body with the base64 data (data URL prefix allowed)
+    Query param: filename (optional)
+    The body is decoded in blocks instead of being loaded through json.loads
+    """
+    tmp_path = None
+    try:
+        filename = request.GET.get('filename', 'uploaded_image.jpg')
+        max_size = 10 * 1024 * 1024  # 10MB
+        
+        # Reject bodies that cannot fit before reading them: base64 of max_size
+        # bytes, allowing for 76-column line wrapping and a data URL prefix
+        max_body_size = (max_size + 2) // 3 * 4 * 78 // 76 + 256
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > max_body_size:
+            return OrjsonResponse({
+                'success': False,
+                'error': 'File too large. Maximum size is 10MB'
+            }, status=400)
+        
+        # Stream decode + hash + write in a single pass
+        with tempfile.NamedTemporaryFile(
+            dir=ensure_upload_directory(), suffix='.part', delete=False, buffering=WRITE_BUFFER_SIZE
+        ) as destination:
+            tmp_path = destination.name
+            try:
+                file_hash, file_size = stream_decode_base64(request, destination, max_size)
+            except ValueError as e:
+                error = str(e)
+                file_hash = None
+        
+        if not file_hash:
+            discard_staged_file(tmp_path)
+            return OrjsonResponse({
+                'success': False,
+                'error': error
+            }, status=400)
+        
+        # Check if image already exists
+        existing_image = Image.objects.filter(file_hash=file_hash).first()
+        if existing_image:
+            discard_staged_file(tmp_path)
+            return OrjsonResponse({
+                'success': True,
+                'message': 'Image already exists',
+                'image_id': existing_image.id,
+                'file_path': existing_image.file_path,
+                'duplicate': True
+            })
+        
+        # Move staged file to its final location
+        file_extension = get_file_extension(filename) or '.jpg'
+        file_path = save_staged_file(tmp_path, file_hash, file_extension)
+        tmp_path = None
+        
+        # Create database record
+        image = Image.objects.create(
+            file_path=file_path,
+            file_hash=file_hash,
+            original_filename=filename,
+            file_size=file_size,
+            uploaded_by=request.user
+        )
+        
+        logger.info(f"Streamed base64 image uploaded successfully: {image.id} - {filename} by {request.user.email}")
+        
+        return OrjsonResponse({
+            'success': True,
+            'message': 'Base64 image uploaded successfully',
+            'image_id': image.id,
+            'file_path': image.file_path,
+            'file_hash': image.file_hash,
+            'original_filename': image.original_filename,
+            'file_size': image.file_size,
+            'uploaded_at': image.uploaded_at,
+            'duplicate': False
+        })
+        
+    except Exception as e:
+        if tmp_path:
+            discard_staged_file(tmp_path)
+        logger.error(f"Error uploading streamed base64 image: {str(e)}")
+        return OrjsonResponse({
             'success': False,
             'error': 'Internal server error'
         }, status=500)
@@ -458,13 +770,13 @@ def upload_batch_base64_images(request):
         images_data = data.get('images', [])
         
         if not images_data:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'No images data provided'
             }, status=400)
         
         if len(images_data) > 20:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'Too many images. Maximum 20 images per batch'
             }, status=400)
@@ -474,7 +786,19 @@ def upload_batch_base64_images(request):
         errors = []
         max_size = 10 * 1024 * 1024  # 10MB
         
-        for i, img_data in enumerate(images_data):
+        def decode_item(img_data):
+            base64_data = img_data.get('image_data', '')
+            # Missing and oversized payloads are rejected without being decoded
+            if not base64_data or estimate_base64_size(base64_data) > max_size:
+                return None
+            return decode_hash_and_stage(base64_data, max_size)
+        
+        # Decode, hash and write all images to staging files in parallel,
+        # so no disk writes happen on the request thread
+        decoded = run_in_upload_pool(decode_item, images_data)
+        
+        staged = []
+        for i, (img_data, (result, error)) in enumerate(zip(images_data, decoded)):
             try:
                 base64_data = img_data.get('image_data', '')
                 filename = img_data.get('filename', f'uploaded_image_{i+1}.jpg')
@@ -483,69 +807,89 @@ def upload_batch_base64_images(request):
                     errors.append(f"Image {i+1}: No base64 data provided")
                     continue
                 
-                uploaded_file, file_size = decode_base64_image(base64_data, filename)
-                
-                if not uploaded_file:
-                    errors.append(f"Image {i+1} ({filename}): Invalid base64 data")
-                    continue
-                
                 # Validate file size
-                if file_size > max_size:
+                if estimate_base64_size(base64_data) > max_size:
                     errors.append(f"Image {i+1} ({filename}): File too large (max 10MB)")
                     continue
                 
-                # Get image content for hash calculation
-                uploaded_file.seek(0)
-                image_content = uploaded_file.read()
+                if isinstance(error, ValueError):
+                    errors.append(f"Image {i+1} ({filename}): Invalid base64 data")
+                    continue
+                
+                if error:
+                    raise error
                 
-                # Calculate file hash
-                file_hash = calculate_file_hash_from_content(image_content)
+                file_hash, tmp_path, file_size = result
+                staged.append((i, filename, tmp_path, file_hash, file_size))
                 
+            except Exception as e:
+                errors.append(f"Image {i+1}: {str(e)}")
+        
+        # One query for every hash already stored
+        existing_images = Image.objects.in_bulk(
+            [file_hash for _, _, _, file_hash, _ in staged], field_name='file_hash'
+        )
+        
+        entries = []
+        new_images = {}
+        for i, filename, tmp_path, file_hash, file_size in staged:
+            try:
                 # Check if image already exists
-                existing_image = Image.objects.filter(file_hash=file_hash).first()
-                if existing_image:
-                    results.append({
-                        'index': i + 1,
-                        'filename': filename,
-                        'status': 'duplicate',
-                        'message': 'Image already exists',
-                        'image_id': existing_image.id,
-                        'file_path': existing_image.file_path
-                    })
+                if file_hash in existing_images or file_hash in new_images:
+                    discard_staged_file(tmp_path)
+                    entries.append((i, filename, file_hash, 'duplicate'))
                     continue
                 
-                # Save file to disk
-                file_path = save_image_from_content(image_content, file_hash, filename)
+                # Move staged file to its final location
+                file_extension = get_file_extension(filename) or '.jpg'
+                file_path = save_staged_file(tmp_path, file_hash, file_extension)
                 
-                # Create database record
-                image = Image.objects.create(
+                new_images[file_hash] = Image(
                     file_path=file_path,
                     file_hash=file_hash,
                     original_filename=filename,
                     file_size=file_size,
                     uploaded_by=request.user
                 )
+                entries.append((i, filename, file_hash, 'success'))
                 
+            except Exception as e:
+                discard_staged_file(tmp_path)
+                errors.append(f"Image {i+1}: {str(e)}")
+        
+        # Create all new database records at once (rows raced in by another request are skipped)
+        new_images, raced = bulk_create_images(new_images)
+        
+        for i, filename, file_hash, status in entries:
+            if status == 'duplicate' or file_hash in raced:
+                existing_image = existing_images.get(file_hash) or new_images[file_hash]
                 results.append({
                     'index': i + 1,
                     'filename': filename,
-                    'status': 'success',
-                    'message': 'Image uploaded successfully',
-                    'image_id': image.id,
-                    'file_path': image.file_path,
-                    'file_hash': image.file_hash,
-                    'file_size': image.file_size,
-                    'uploaded_at': image.uploaded_at.isoformat()
+                    'status': 'duplicate',
+                    'message': 'Image already exists',
+                    'image_id': existing_image.id,
+                    'file_path': existing_image.file_path
                 })
-                
-                successful_uploads += 1
-                
-            except Exception as e:
-                errors.append(f"Image {i+1}: {str(e)}")
+                continue
+            
+            image = new_images[file_hash]
+            results.append({
+                'index': i + 1,
+                'filename': filename,
+                'status': 'success',
+                'message': 'Image uploaded successfully',
+                'image_id': image.id,
+                'file_path': image.file_path,
+                'file_hash': image.file_hash,
+                'file_size': image.file_size,
+                'uploaded_at': image.uploaded_at
+            })
+            successful_uploads += 1
         
         logger.info(f"Batch base64 upload completed: {successful_uploads} successful, {len(errors)} errors by {request.user.email}")
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'message': f'Batch base64 upload completed: {successful_uploads}/{len(images_data)} images processed',
             'results': results,
@@ -555,13 +899,13 @@ def upload_batch_base64_images(request):
         })
         
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
         logger.error(f"Error in batch base64 upload: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Internal server error'
         }, status=500)
@@ -628,48 +972,6 @@ def get_image_info(request, image_id):
             'error': 'Internal server error'
         }, status=500)
 
-@require_http_methods(["GET"])
-def list_images(request):
-    try:
-        images = Image.objects.all().order_by('-uploaded_at')
-        
-        user_id = request.GET.get('user_id')
-        if user_id:
-            images = images.filter(uploaded_by_id=user_id)
-        
-        limit = int(request.GET.get('limit', 20))
-        offset = int(request.GET.get('offset', 0))
-        
-        total_count = images.count()
-        images = images[offset:offset + limit]
-        
-        images_data = []
-        for image in images:
-            images_data.append({
-                'id': image.id,
-                'file_path': image.file_path,
-                'file_hash': image.file_hash,
-                'original_filename': image.original_filename,
-                'file_size': image.file_size,
-                'uploaded_at': image.uploaded_at.isoformat(),
-                'uploaded_by': image.uploaded_by.email if image.uploaded_by else None
-            })
-        
-        return JsonResponse({
-            'success': True,
-            'images': images_data,
-            'total_count': total_count,
-            'limit': limit,
-            'offset': offset
-        })
-        
-    except Exception as e:
-        logger.error(f"Error listing images: {str(e)}")
-        return JsonResponse({
-            'success': False,
-            'error': 'Internal server error'
-        }, status=500)
-
 @require_http_methods(["GET"])
 def upload_page(request):
     """Render the HTML upload page"""
@@ -692,8 +994,6 @@ def upload_image_with_classification(request):
     - Batch: {"images": [{"image_data": "base64", "classification": "stage1", ...}]}
     """
     try:
-        from classification.models import Classification
-        
         # Check content type to determine processing method
         content_type = request.content_type
         
@@ -702,22 +1002,20 @@ def upload_image_with_classification(request):
         elif 'application/json' in content_type:
             return _handle_json_upload_with_classification(request)
         else:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'Unsupported content type. Use multipart/form-data or application/json'
             }, status=400)
             
     except Exception as e:
         logger.error(f"Error in upload with classification: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Internal server error'
         }, status=500)
 
 def _handle_multipart_upload_with_classification(request):
     """Handle multipart form upload with classification"""
-    from classification.models import Classification
-    
     # Get files
     uploaded_files = request.FILES.getlist('images') if 'images' in request.FILES else []
     single_file = request.FILES.get('image')
@@ -726,7 +1024,7 @@ def _handle_multipart_upload_with_classification(request):
         uploaded_files = [single_file]
     
     if not uploaded_files:
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'No image files provided'
         }, status=400)
@@ -745,14 +1043,10 @@ def _handle_multipart_upload_with_classification(request):
     if single_comment and not comments:
         comments = [single_comment]
     
-    # Validate classification choices
-    valid_choices = [choice[0] for choice in Classification.CLASSIFICATION_CHOICES]
-    
     results = []
     successful_uploads = 0
     errors = []
     
-    allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
     max_size = 10 * 1024 * 1024
     
     for i, uploaded_file in enumerate(uploaded_files):
@@ -765,13 +1059,13 @@ def _handle_multipart_upload_with_classification(request):
                 errors.append(f"File {i+1} ({uploaded_file.name}): No classification provided")
                 continue
             
-            if classification not in valid_choices:
+            if classification not in _VALID_CLASSIFICATIONS:
                 errors.append(f"File {i+1} ({uploaded_file.name}): Invalid classification '{classification}'")
                 continue
             
-            # Validate file
-            file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-            if file_extension not in allowed_extensions:
+            # Validate file type from its magic bytes
+            file_extension = sniff_image_extension(uploaded_file)
+            if file_extension is None:
                 errors.append(f"File {i+1} ({uploaded_file.name}): Invalid file type")
                 continue
             
@@ -810,7 +1104,7 @@ def _handle_multipart_upload_with_classification(request):
                 continue
             
             # Save new image
-            file_path = save_uploaded_file(uploaded_file, file_hash)
+            file_path = save_uploaded_file(uploaded_file, file_hash, file_extension)
             
             image = Image.objects.create(
                 file_path=file_path,
@@ -837,12 +1131,12 @@ def _handle_multipart_upload_with_classification(request):
                 'file_path': image.file_path,
                 'file_hash': image.file_hash,
                 'file_size': image.file_size,
-                'uploaded_at': image.uploaded_at.isoformat(),
+                'uploaded_at': image.uploaded_at,
                 'classification': {
                     'id': classification_obj.id,
                     'classification': classification_obj.classification,
                     'comment': classification_obj.comment,
-                    'created_at': classification_obj.created_at.isoformat()
+                    'created_at': classification_obj.created_at
                 }
             })
             
@@ -853,7 +1147,7 @@ def _handle_multipart_upload_with_classification(request):
     
     logger.info(f"Upload with classification completed: {successful_uploads} successful, {len(errors)} errors by {request.user.email}")
     
-    return JsonResponse({
+    return OrjsonResponse({
         'success': True,
         'message': f'Upload with classification completed: {successful_uploads}/{len(uploaded_files)} files processed',
         'results': results,
@@ -864,8 +1158,6 @@ def _handle_multipart_upload_with_classification(request):
 
 def _handle_json_upload_with_classification(request):
     """Handle JSON base64 upload with classification"""
-    from classification.models import Classification
-    
     data = json.loads(request.body)
     
     # Single image or batch?
@@ -876,23 +1168,24 @@ def _handle_json_upload_with_classification(request):
         # Batch images
         images_data = data.get('images', [])
     else:
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'No image data provided. Use "image_data" for single or "images" for batch'
         }, status=400)
     
     if len(images_data) > 20:
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Too many images. Maximum 20 images per batch'
         }, status=400)
     
-    valid_choices = [choice[0] for choice in Classification.CLASSIFICATION_CHOICES]
     results = []
     successful_uploads = 0
     errors = []
     max_size = 10 * 1024 * 1024
     
+    # Validate the cheap fields first so only accepted images are decoded
+    pending = []
     for i, img_data in enumerate(images_data):
         try:
             base64_data = img_data.get('image_data', '')
@@ -908,74 +1201,107 @@ def _handle_json_upload_with_classification(request):
                 errors.append(f"Image {i+1} ({filename}): No classification provided")
                 continue
             
-            if classification not in valid_choices:
+            if classification not in _VALID_CLASSIFICATIONS:
                 errors.append(f"Image {i+1} ({filename}): Invalid classification '{classification}'")
                 continue
             
-            # Decode base64 image
-            uploaded_file, file_size = decode_base64_image(base64_data, filename)
-            
-            if not uploaded_file:
-                errors.append(f"Image {i+1} ({filename}): Invalid base64 data")
-                continue
-            
-            if file_size > max_size:
+            if estimate_base64_size(base64_data) > max_size:
                 errors.append(f"Image {i+1} ({filename}): File too large (max 10MB)")
                 continue
             
-            # Get image content for hash calculation
-            uploaded_file.seek(0)
-            image_content = uploaded_file.read()
+            pending.append((i, filename, classification, comment, base64_data))
             
-            # Calculate file hash
-            file_hash = calculate_file_hash_from_content(image_content)
-            
-            # Check if image already exists
-            existing_image = Image.objects.filter(file_hash=file_hash).first()
-            if existing_image:
-                # Create classification for existing image
-                classification_obj = Classification.objects.create(
-                    user=request.user,
-                    image=existing_image,
-                    classification=classification,
-                    comment=comment
-                )
-                
-                results.append({
-                    'index': i + 1,
-                    'filename': filename,
-                    'status': 'duplicate_with_classification',
-                    'message': 'Image already exists, classification added',
-                    'image_id': existing_image.id,
-                    'file_path': existing_image.file_path,
-                    'classification': {
-                        'id': classification_obj.id,
-                        'classification': classification_obj.classification,
-                        'comment': classification_obj.comment
-                    }
-                })
-                successful_uploads += 1
+        except Exception as e:
+            errors.append(f"Image {i+1}: {str(e)}")
+    
+    # Decode, hash and stage all images in parallel (base64, hashlib and file I/O release the GIL)
+    decoded = run_in_upload_pool(lambda item: decode_hash_and_stage(item[4], max_size), pending)
+    
+    staged = []
+    for (i, filename, classification, comment, _), (result, error) in zip(pending, decoded):
+        if isinstance(error, ValueError):
+            errors.append(f"Image {i+1} ({filename}): Invalid base64 data")
+            continue
+        if error:
+            errors.append(f"Image {i+1}: {str(error)}")
+            continue
+        
+        file_hash, tmp_path, file_size = result
+        staged.append((i, filename, classification, comment, tmp_path, file_hash, file_size))
+    
+    # One query for every hash already stored
+    existing_images = Image.objects.in_bulk(
+        [item[5] for item in staged], field_name='file_hash'
+    )
+    
+    entries = []
+    new_images = {}
+    for i, filename, classification, comment, tmp_path, file_hash, file_size in staged:
+        try:
+            # Existing images (in the database or earlier in this batch) only get a classification
+            if file_hash in existing_images or file_hash in new_images:
+                discard_staged_file(tmp_path)
+                entries.append((i, filename, file_hash, classification, comment, 'duplicate_with_classification'))
                 continue
             
-            # Save new image
-            file_path = save_image_from_content(image_content, file_hash, filename)
+            # Move staged image to its final location
+            file_extension = get_file_extension(filename) or '.jpg'
+            file_path = save_staged_file(tmp_path, file_hash, file_extension)
             
-            image = Image.objects.create(
+            new_images[file_hash] = Image(
                 file_path=file_path,
                 file_hash=file_hash,
                 original_filename=filename,
                 file_size=file_size,
                 uploaded_by=request.user
             )
+            entries.append((i, filename, file_hash, classification, comment, 'success'))
             
-            # Create classification
-            classification_obj = Classification.objects.create(
-                user=request.user,
-                image=image,
-                classification=classification,
-                comment=comment
-            )
+        except Exception as e:
+            discard_staged_file(tmp_path)
+            errors.append(f"Image {i+1}: {str(e)}")
+    
+    # Create all images, then all classifications, in bulk. If either fails
+    # nothing is kept, including the files already moved into place
+    try:
+        with transaction.atomic():
+            stored_images, raced = bulk_create_images(new_images)
+            existing_images.update(stored_images)
             
+            classification_objs = Classification.objects.bulk_create([
+                Classification(
+                    user=request.user,
+                    image=existing_images[file_hash],
+                    stage=classification,
+                    observations=comment
+                )
+                for _, _, file_hash, classification, comment, _ in entries
+            ])
+    except Exception as e:
+        discard_unstored_images(new_images)
+        logger.error(f"Error saving JSON upload with classification: {str(e)}")
+        return OrjsonResponse({
+            'success': False,
+            'message': 'Could not save the uploaded images'
+        }, status=500)
+    
+    for (i, filename, file_hash, _, _, status), classification_obj in zip(entries, classification_objs):
+        image = existing_images[file_hash]
+        if status == 'duplicate_with_classification' or file_hash in raced:
+            results.append({
+                'index': i + 1,
+                'filename': filename,
+                'status': 'duplicate_with_classification',
+                'message': 'Image already exists, classification added',
+                'image_id': image.id,
+                'file_path': image.file_path,
+                'classification': {
+                    'id': classification_obj.id,
+                    'classification': classification_obj.stage,
+                    'comment': classification_obj.observations
+                }
+            })
+        else:
             results.append({
                 'index': i + 1,
                 'filename': filename,
@@ -985,23 +1311,19 @@ def _handle_json_upload_with_classification(request):
                 'file_path': image.file_path,
                 'file_hash': image.file_hash,
                 'file_size': image.file_size,
-                'uploaded_at': image.uploaded_at.isoformat(),
+                'uploaded_at': image.uploaded_at,
                 'classification': {
                     'id': classification_obj.id,
-                    'classification': classification_obj.classification,
-                    'comment': classification_obj.comment,
-                    'created_at': classification_obj.created_at.isoformat()
+                    'classification': classification_obj.stage,
+                    'comment': classification_obj.observations,
+                    'created_at': classification_obj.created_at
                 }
             })
-            
-            successful_uploads += 1
-            
-        except Exception as e:
-            errors.append(f"Image {i+1}: {str(e)}")
+        successful_uploads += 1
     
     logger.info(f"JSON upload with classification completed: {successful_uploads} successful, {len(errors)} errors by {request.user.email}")
     
-    return JsonResponse({
+    return OrjsonResponse({
         'success': True,
         'message': f'Upload with classification completed: {successful_uploads}/{len(images_data)} images processed',
         'results': results,
@@ -1045,19 +1367,31 @@ def list_images(request):
     """
     GET /images/
     Auth required
+    Optional query params: limit, offset
     Response: 200 OK, [ { id, url } ]
     """
     try:
-        images = Image.objects.all().order_by('-uploaded_at')
+        # Only the two columns the response needs, as plain tuples straight from the driver
+        rows = Image.objects.order_by('-uploaded_at').values_list('id', 'file_path')
         
-        images_data = []
-        for image in images:
-            # Generate URL based on MEDIA_URL and file_path
-            url = f"{settings.MEDIA_URL}{image.file_path}" if image.file_path else None
-            images_data.append({
-                'id': image.id,
-                'url': url
-            })
+        try:
+            offset = int(request.GET.get('offset', 0))
+            limit = request.GET.get('limit')
+            if limit is not None:
+                rows = rows[offset:offset + int(limit)]
+            elif offset:
+                rows = rows[offset:]
+        except ValueError:
+            return JsonResponse({
+                'message': 'limit and offset must be non-negative integers'
+            }, status=400)
+        
+        # Generate URL based on MEDIA_URL and file_path, without building model instances
+        media_url = settings.MEDIA_URL
+        images_data = [{
+            'id': image_id,
+            'url': f"{media_url}{file_path}" if file_path else None
+        } for image_id, file_path in rows.iterator(chunk_size=2000)]
         
         return JsonResponse(images_data, safe=False, status=200)
         
@@ -1092,68 +1426,93 @@ def upload_batch_images(request):
     try:
         import uuid
         
+        # Hash and stage files while they are received
+        use_staging_upload_handler(request)
+        
         # Get all image files
         uploaded_files = request.FILES.getlist('images')
         
         if not uploaded_files:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'No image files provided'
             }, status=400)
         
         upload_batch_id = str(uuid.uuid4())
         uploaded = []
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
         max_size = 10 * 1024 * 1024
         
+        # Validate first so only accepted files are hashed
+        valid_files = []
         for uploaded_file in uploaded_files:
+            # Validate file type from its magic bytes
+            file_extension = sniff_image_extension(uploaded_file)
+            if file_extension is None:
+                continue
+            
+            # Validate file size
+            if uploaded_file.size > max_size:
+                continue
+            
+            valid_files.append((uploaded_file, file_extension))
+        
+        # Hash and stage files in parallel (hashlib and file I/O release the GIL)
+        staged = []
+        outcomes = run_in_upload_pool(lambda item: hash_and_stage(item[0]), valid_files)
+        for (uploaded_file, file_extension), (result, error) in zip(valid_files, outcomes):
+            if error:
+                logger.error(f"Error processing file {uploaded_file.name}: {str(error)}")
+                continue
+            file_hash, tmp_path = result
+            staged.append((uploaded_file, file_extension, file_hash, tmp_path))
+        
+        # One query for every hash already stored
+        existing_images = Image.objects.in_bulk(
+            [file_hash for _, _, file_hash, _ in staged], field_name='file_hash'
+        )
+        
+        entries = []
+        new_images = {}
+        for uploaded_file, file_extension, file_hash, tmp_path in staged:
             try:
-                # Validate file type
-                file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-                if file_extension not in allowed_extensions:
-                    continue
-                
-                # Validate file size
-                if uploaded_file.size > max_size:
-                    continue
-                
-                # Calculate file hash
-                file_hash = calculate_file_hash(uploaded_file)
-                
-                # Check if image already exists (skip if exists)
-                existing_image = Image.objects.filter(file_hash=file_hash).first()
-                if existing_image:
-                    uploaded.append({
-                        'id': existing_image.id,
-                        'url': f"{settings.MEDIA_URL}{existing_image.file_path}",
-                        'status': 'existing'
-                    })
+                # Skip files that already exist (in the database or earlier in this batch)
+                if file_hash in existing_images or file_hash in new_images:
+                    discard_staged_file(tmp_path)
+                    entries.append((file_hash, 'existing'))
                     continue
                 
-                # Save file to disk
-                file_path = save_uploaded_file(uploaded_file, file_hash)
+                # Move staged file to its final location
+                file_path = save_staged_file(tmp_path, file_hash, file_extension)
                 
-                # Create database record
-                image = Image.objects.create(
+                new_images[file_hash] = Image(
                     file_path=file_path,
                     file_hash=file_hash,
                     original_filename=uploaded_file.name,
                     file_size=uploaded_file.size,
                     uploaded_by=request.user
                 )
-                
-                uploaded.append({
-                    'id': image.id,
-                    'url': f"{settings.MEDIA_URL}{image.file_path}",
-                    'status': 'uploaded'
-                })
+                entries.append((file_hash, 'uploaded'))
                 
             except Exception as e:
+                discard_staged_file(tmp_path)
                 logger.error(f"Error processing file {uploaded_file.name}: {str(e)}")
                 continue
         
+        # Create all new database records at once (rows raced in by another request are skipped)
+        stored_images, raced = bulk_create_images(new_images)
+        existing_images.update(stored_images)
+        
+        media_url = settings.MEDIA_URL
+        for file_hash, status in entries:
+            image = existing_images[file_hash]
+            uploaded.append({
+                'id': image.id,
+                'url': f"{media_url}{image.file_path}",
+                'status': 'existing' if file_hash in raced else status
+            })
+        
         logger.info(f"Batch upload completed: {len(uploaded)} files processed by {request.user.name}")
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'upload_batch_id': upload_batch_id,
             'uploaded': uploaded
@@ -1161,7 +1520,7 @@ def upload_batch_images(request):
         
     except Exception as e:
         logger.error(f"Error in batch upload: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Internal server error'
         }, status=500)
 
@@ -1188,45 +1547,48 @@ def upload_single_image(request):
     Response: 201 Created, { image: { id, url } }
     """
     try:
+        # Hash and stage the file while it is received
+        use_staging_upload_handler(request)
+        
         # Check if image file was provided
         if 'image' not in request.FILES:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'No image file provided'
             }, status=400)
         
         uploaded_file = request.FILES['image']
         
-        # Validate file type
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
-        file_extension = os.path.splitext(uploaded_file.name)[1].lower()
+        # Validate file type from its magic bytes
+        file_extension = sniff_image_extension(uploaded_file)
         
-        if file_extension not in allowed_extensions:
-            return JsonResponse({
-                'message': f'File type not allowed. Allowed types: {", ".join(allowed_extensions)}'
+        if file_extension is None:
+            return OrjsonResponse({
+                'message': f'File type not allowed. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'
             }, status=400)
         
         # Validate file size (max 10MB)
         max_size = 10 * 1024 * 1024
         if uploaded_file.size > max_size:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'File too large. Maximum size is 10MB'
             }, status=400)
         
-        # Calculate file hash
-        file_hash = calculate_file_hash(uploaded_file)
+        # Hash the file while streaming it to a staging file (single pass)
+        file_hash, tmp_path = hash_and_stage(uploaded_file)
         
         # Check if image already exists
         existing_image = Image.objects.filter(file_hash=file_hash).first()
         if existing_image:
-            return JsonResponse({
+            discard_staged_file(tmp_path)
+            return OrjsonResponse({
                 'image': {
                     'id': existing_image.id,
                     'url': f"{settings.MEDIA_URL}{existing_image.file_path}"
                 }
             }, status=201)
         
-        # Save file to disk
-        file_path = save_uploaded_file(uploaded_file, file_hash)
+        # Move staged file to its final location
+        file_path = save_staged_file(tmp_path, file_hash, file_extension)
         
         # Create database record
         image = Image.objects.create(
@@ -1239,7 +1601,7 @@ def upload_single_image(request):
         
         logger.info(f"Single image uploaded: {image.id} - {uploaded_file.name} by {request.user.name}")
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'image': {
                 'id': image.id,
@@ -1249,7 +1611,7 @@ def upload_single_image(request):
         
     except Exception as e:
         logger.error(f"Error uploading single image: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Internal server error'
         }, status=500)
 
@@ -1278,100 +1640,135 @@ def upload_with_stage(request):
     """
     try:
         import uuid
-        from classification.models import Classification
         
         # Get stage from query parameter
         stage = request.GET.get('stage')
         if not stage:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'Stage parameter is required'
             }, status=400)
         
         # Validate stage value
-        valid_stages = [choice[0] for choice in Classification.CLASSIFICATION_CHOICES]
-        if stage not in valid_stages:
-            return JsonResponse({
+        if stage not in _VALID_CLASSIFICATIONS:
+            valid_stages = [choice[0] for choice in Classification.CLASSIFICATION_CHOICES]
+            return OrjsonResponse({
                 'message': f'Invalid stage. Valid options: {valid_stages}'
             }, status=400)
         
+        # Hash and stage files while they are received
+        use_staging_upload_handler(request)
+        
         # Get all image files
         uploaded_files = request.FILES.getlist('images')
         
         if not uploaded_files:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'No image files provided'
             }, status=400)
         
         upload_batch_id = str(uuid.uuid4())
         uploaded = []
         classified = []
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
         max_size = 10 * 1024 * 1024
         
+        # Validate first so only accepted files are hashed
+        valid_files = []
         for uploaded_file in uploaded_files:
+            # Validate file type from its magic bytes
+            file_extension = sniff_image_extension(uploaded_file)
+            if file_extension is None:
+                continue
+            
+            # Validate file size
+            if uploaded_file.size > max_size:
+                continue
+            
+            valid_files.append((uploaded_file, file_extension))
+        
+        # Hash and stage files in parallel (hashlib and file I/O release the GIL)
+        staged = []
+        outcomes = run_in_upload_pool(lambda item: hash_and_stage(item[0]), valid_files)
+        for (uploaded_file, file_extension), (result, error) in zip(valid_files, outcomes):
+            if error:
+                logger.error(f"Error processing file {uploaded_file.name}: {str(error)}")
+                continue
+            file_hash, tmp_path = result
+            staged.append((uploaded_file, file_extension, file_hash, tmp_path))
+        
+        # One query for every hash already stored
+        existing_images = Image.objects.in_bulk(
+            [file_hash for _, _, file_hash, _ in staged], field_name='file_hash'
+        )
+        
+        entries = []
+        new_images = {}
+        for uploaded_file, file_extension, file_hash, tmp_path in staged:
             try:
-                # Validate file type
-                file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-                if file_extension not in allowed_extensions:
-                    continue
-                
-                # Validate file size
-                if uploaded_file.size > max_size:
+                # Reuse images that already exist (in the database or earlier in this batch)
+                if file_hash in existing_images or file_hash in new_images:
+                    discard_staged_file(tmp_path)
+                    entries.append((file_hash, 'existing'))
                     continue
                 
-                # Calculate file hash
-                file_hash = calculate_file_hash(uploaded_file)
-                
-                # Check if image already exists
-                existing_image = Image.objects.filter(file_hash=file_hash).first()
-                if existing_image:
-                    image = existing_image
-                    uploaded.append({
-                        'id': image.id,
-                        'url': f"{settings.MEDIA_URL}{image.file_path}",
-                        'status': 'existing'
-                    })
-                else:
-                    # Save new file
-                    file_path = save_uploaded_file(uploaded_file, file_hash)
-                    
-                    # Create database record
-                    image = Image.objects.create(
-                        file_path=file_path,
-                        file_hash=file_hash,
-                        original_filename=uploaded_file.name,
-                        file_size=uploaded_file.size,
-                        uploaded_by=request.user
-                    )
-                    
-                    uploaded.append({
-                        'id': image.id,
-                        'url': f"{settings.MEDIA_URL}{image.file_path}",
-                        'status': 'uploaded'
-                    })
-                
-                # Create classification for the image
-                classification = Classification.objects.create(
-                    user=request.user,
-                    image=image,
-                    stage=stage,
-                    observations=''  # No observations for batch classification
+                image = Image(
+                    file_hash=file_hash,
+                    original_filename=uploaded_file.name,
+                    file_size=uploaded_file.size,
+                    uploaded_by=request.user
                 )
                 
-                classified.append({
-                    'id': classification.id,
-                    'image_id': image.id,
-                    'stage': stage,
-                    'created_at': classification.created_at.isoformat()
-                })
+                # Move staged file to its final location only once its row is built,
+                # so a file whose row cannot be created stays staged and is discarded
+                image.file_path = save_staged_file(tmp_path, file_hash, file_extension)
+                new_images[file_hash] = image
+                entries.append((file_hash, 'uploaded'))
                 
             except Exception as e:
+                discard_staged_file(tmp_path)
                 logger.error(f"Error processing file {uploaded_file.name}: {str(e)}")
                 continue
         
+        # Create all images, then all classifications, in bulk. If either fails
+        # nothing is kept, including the files already moved into place
+        try:
+            with transaction.atomic():
+                stored_images, raced = bulk_create_images(new_images)
+                existing_images.update(stored_images)
+                
+                classifications = Classification.objects.bulk_create([
+                    Classification(
+                        user=request.user,
+                        image=existing_images[file_hash],
+                        stage=stage,
+                        observations=''  # No observations for batch classification
+                    )
+                    for file_hash, _ in entries
+                ])
+        except Exception as e:
+            discard_unstored_images(new_images)
+            logger.error(f"Error saving upload with stage: {str(e)}")
+            return OrjsonResponse({
+                'message': 'Could not save the uploaded images'
+            }, status=500)
+        
+        media_url = settings.MEDIA_URL
+        for (file_hash, status), classification in zip(entries, classifications):
+            image = existing_images[file_hash]
+            uploaded.append({
+                'id': image.id,
+                'url': f"{media_url}{image.file_path}",
+                'status': 'existing' if file_hash in raced else status
+            })
+            classified.append({
+                'id': classification.id,
+                'image_id': image.id,
+                'stage': stage,
+                'created_at': classification.created_at
+            })
+        
         logger.info(f"Upload with stage completed: {len(uploaded)} files, {len(classified)} classified as {stage} by {request.user.name}")
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'upload_batch_id': upload_batch_id,
             'uploaded': uploaded,
@@ -1381,8 +1778,23 @@ def upload_with_stage(request):
         
     except Exception as e:
         logger.error(f"Error in upload with stage: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Internal server error'
         }, status=500)
 
+@require_http_methods(["GET", "HEAD"])
+def serve_media(request, path):
+    """
+    Serve a media file through nginx (MEDIA_ACCEL_REDIRECT_PREFIX) so the file
+    bytes never pass through Django
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    if path.startswith('..'):
+        raise Http404('Media file not found')
+    
+    content_type, _ = mimetypes.guess_type(path)
+    response = HttpResponse(content_type=content_type or 'application/octet-stream')
+    response['X-Accel-Redirect'] = f"{settings.MEDIA_ACCEL_REDIRECT_PREFIX}{path}"
+    return response
+
 # Create your views here.
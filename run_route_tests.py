@@ -31,6 +31,10 @@ def main():
         print("Error: manage.py not found. Please run this script from the project root.")
         sys.exit(1)
     
+    # File-backed test database for --keepdb to reuse (see DATABASES in settings);
+    # the manage.py subprocesses inherit it
+    os.environ.setdefault('TEST_DB_FILE', 'test_db.sqlite3')
+    
     # Get python executable path
     python_path = sys.executable
     if '.venv' in os.getcwd():
@@ -40,10 +44,10 @@ def main():
     
     # Test commands to run
     test_commands = [
-        (f"{python_path} manage.py test users.test_routes", "User Authentication Routes"),
-        (f"{python_path} manage.py test users.test_admin_routes", "Admin Routes"), 
-        (f"{python_path} manage.py test images.test_routes", "Image Management Routes"),
-        (f"{python_path} manage.py test classification.test_routes", "Classification Routes"),
+        (f"{python_path} manage.py test --keepdb users.test_routes", "User Authentication Routes"),
+        (f"{python_path} manage.py test --keepdb users.test_admin_routes", "Admin Routes"), 
+        (f"{python_path} manage.py test --keepdb images.test_routes", "Image Management Routes"),
+        (f"{python_path} manage.py test --keepdb classification.test_routes", "Classification Routes"),
     ]
     
     # Run individual test suites
@@ -57,7 +61,9 @@ def main():
     print("Running All Route Tests Together")
     print('='*60)
     
-    all_tests_command = f"{python_path} manage.py test users.test_routes users.test_admin_routes images.test_routes classification.test_routes"
+    # Test cases are independent, so spread them over one worker process per core.
+    # --keepdb reuses the test database (and its clones) left by the previous run
+    all_tests_command = f"{python_path} manage.py test --keepdb --parallel auto users.test_routes users.test_admin_routes images.test_routes classification.test_routes"
     all_success = run_command(all_tests_command, "All Route Tests Combined")
     
     # Summary
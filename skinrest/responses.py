@@ -0,0 +1,44 @@
+import json
+
+from django.http import HttpResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_default(obj):
+    """Serialize values the stdlib encoder does not know (fallback path only)"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Serialize data to JSON bytes, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_json_default).encode()
+
+
+def loads(data):
+    """
+    Parse JSON from bytes or str, using orjson when installed.
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the stdlib one.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class OrjsonResponse(HttpResponse):
+    """
+    JsonResponse replacement that serializes with orjson.
+    datetime values are serialized natively (ISO 8601), so no .isoformat() is needed.
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
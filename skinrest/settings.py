@@ -11,7 +11,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -162,6 +164,11 @@ DATABASES = {
     }
 }
 
+# run_route_tests.py sets TEST_DB_FILE so `manage.py test --keepdb` has a file
+# to reuse between runs; plain test runs keep the in-memory test database
+if os.environ.get('TEST_DB_FILE'):
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / os.environ['TEST_DB_FILE']}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -181,6 +188,26 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Argon2id verifies faster than the default ~1M-iteration PBKDF2 while being harder to
+# attack on GPUs. Existing PBKDF2 hashes still verify and are upgraded on login.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if importlib.util.find_spec('argon2') is not None:
+    PASSWORD_HASHERS.insert(0, 'users.hashers.TunedArgon2PasswordHasher')
+
+# Test runs only: PBKDF2 is deliberately slow, and every create_user/login in the
+# test suite pays for it. MD5 is never used outside `manage.py test`.
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
+if TESTING:
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -201,12 +228,29 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 IMAGES_UPLOAD_DIR = 'images'
 
+# Internal nginx location aliasing MEDIA_ROOT (e.g. '/protected-media/'). When set,
+# media requests are answered with X-Accel-Redirect so nginx sends the file itself
+MEDIA_ACCEL_REDIRECT_PREFIX = ''
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.User'
 
+# Same checks as ModelBackend, but login lookups only fetch the columns they need
+AUTHENTICATION_BACKENDS = [
+    'users.backends.EmailBackend',
+]
+
 GOOGLE_CLIENT_ID = 'your-google-client-id-here'
 
+# Failed login attempts allowed per client IP and email each minute before answering 429
+LOGIN_ATTEMPT_LIMIT = 10
+
+# request.META key of the header the reverse proxy (nginx) puts the client address
+# in; its last entry is used as the client IP. Set to '' when Django is reached
+# directly, since clients could then send the header themselves
+CLIENT_IP_HEADER = 'HTTP_X_FORWARDED_FOR'
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
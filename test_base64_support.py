@@ -2,32 +2,20 @@
 """
 Test script for base64 image upload functionality
 """
-import base64
-import io
-from PIL import Image
 import sys
 import os
 
 # Add the project directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from test_fixtures import TEST_JPEG_DATA_URL, TEST_JPEG_SIZE
+
 def create_test_base64_image():
-    """Create a simple test image and convert to base64"""
-    # Create a simple 100x100 red image
-    img = Image.new('RGB', (100, 100), color='red')
-    
-    # Save to bytes
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, format='JPEG')
-    img_bytes = img_bytes.getvalue()
-    
-    # Convert to base64
-    img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-    
-    # Create data URL
-    data_url = f"data:image/jpeg;base64,{img_base64}"
-    
-    return data_url, len(img_bytes)
+    """Return a small test JPEG as a data URL, plus its decoded size"""
+    return TEST_JPEG_DATA_URL, TEST_JPEG_SIZE
+
+# The payload is identical for every check
+DATA_URL, ORIGINAL_SIZE = create_test_base64_image()
 
 def test_base64_decode():
     """Test the base64 decoding function"""
@@ -39,19 +27,16 @@ def test_base64_decode():
         
         from images.views import decode_base64_image
         
-        # Create test image
-        data_url, original_size = create_test_base64_image()
-        print(f"Created test image: {len(data_url)} chars, {original_size} bytes")
+        print(f"Created test image: {len(DATA_URL)} chars, {ORIGINAL_SIZE} bytes")
         
         # Test decoding
-        uploaded_file, file_size = decode_base64_image(data_url, "test_image.jpg")
+        image_content, file_size = decode_base64_image(DATA_URL)
         
-        if uploaded_file:
+        if image_content:
             print(f"✅ Base64 decode successful!")
             print(f"   - File size: {file_size} bytes")
-            print(f"   - Original size: {original_size} bytes")
-            print(f"   - Size match: {file_size == original_size}")
-            print(f"   - Filename: {uploaded_file.name}")
+            print(f"   - Original size: {ORIGINAL_SIZE} bytes")
+            print(f"   - Size match: {file_size == ORIGINAL_SIZE}")
         else:
             print("❌ Base64 decode failed")
             
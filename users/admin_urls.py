@@ -1,7 +1,8 @@
 from django.urls import path
-from . import admin_views
+from .admin_views import get_metrics, list_admin_users, register_users_bulk
 
 urlpatterns = [
-    path('metrics/', admin_views.get_metrics, name='admin_metrics'),
-    path('users/', admin_views.list_admin_users, name='admin_users'),
-]
\ No newline at end of file
+    path('metrics/', get_metrics, name='admin_metrics'),
+    path('users/', list_admin_users, name='admin_users'),
+    path('users/bulk/', register_users_bulk, name='admin_users_bulk'),
+]
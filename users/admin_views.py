@@ -1,14 +1,78 @@
 import json
 import jwt
 import os
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.db import connection
 from django.db.models import Count
+from django.db.models.functions import Lower
 from .models import User
+from .views import decode_jwt_cached, _auth_miss_key, _validate_registration
 from images.models import Image
 from classification.models import Classification
+from skinrest.responses import OrjsonResponse
+
+
+# Admin token secret, read once at import rather than on every request
+_JWT_SECRET = os.getenv('JWT_SECRET_KEY', 'default-secret-key')
+
+# Dashboard refreshes within this window are served from the cache instead of
+# re-running the full-table counts
+METRICS_CACHE_KEY = 'admin:metrics:v1'
+METRICS_CACHE_TIMEOUT = 30
+
+
+# Columns returned for each user by /admin/users/
+ADMIN_USER_FIELDS = (
+    'id', 'email', 'name', 'coren', 'specialty',
+    'is_staff', 'is_active', 'date_joined', 'last_login'
+)
+
+# Page size for /admin/users/ when only ?page= is given, and the largest allowed
+ADMIN_USERS_PAGE_SIZE = 50
+ADMIN_USERS_MAX_PAGE_SIZE = 500
+
+# Largest list accepted by /admin/users/bulk/, and rows per INSERT
+BULK_REGISTER_MAX_USERS = 1000
+BULK_REGISTER_BATCH_SIZE = 500
+
+# Password hashing for bulk registration. The argon2 and PBKDF2 hashers run in
+# C without holding the GIL, so threads hash in parallel on separate cores. Each
+# argon2 hash holds tens of MiB, so the pool is small and shared by all requests
+# of the process; it is only started by the first bulk registration.
+BULK_REGISTER_HASH_WORKERS = min(4, os.cpu_count() or 1)
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool():
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                _hash_pool = ThreadPoolExecutor(max_workers=BULK_REGISTER_HASH_WORKERS)
+    return _hash_pool
+
+
+def count_rows(*models):
+    """
+    Count the rows of several tables with a single query
+    Returns a tuple of counts in the order the models were given
+    """
+    quote_name = connection.ops.quote_name
+    sql = 'SELECT ' + ', '.join(
+        f'(SELECT COUNT(*) FROM {quote_name(model._meta.db_table)})' for model in models
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchone()
 
 
 # JWT verification decorator
@@ -24,14 +88,10 @@ def jwt_required_admin(view_func):
         token = token[7:]  # Remove 'Bearer ' prefix
         
         try:
-            payload = jwt.decode(
-                token, 
-                os.getenv('JWT_SECRET_KEY', 'default-secret-key'),
-                algorithms=['HS256']
-            )
+            payload = decode_jwt_cached(token, _JWT_SECRET)
             
             # Check if user exists and is admin
-            user = User.objects.get(id=payload['user_id'])
+            user = User.objects.only('id', 'is_staff', 'is_active').get(id=payload['user_id'])
             if not user.is_staff:  # Assuming admin privileges through is_staff
                 return JsonResponse({'message': 'Acesso negado. Privilégios de administrador necessários'}, status=403)
                 
@@ -50,6 +110,46 @@ def jwt_required_admin(view_func):
     return wrapper
 
 
+def _compute_metrics():
+    """Build the admin metrics payload from the database"""
+    # Count total users, images and classifications in one round trip
+    total_users, total_images, total_classifications = count_rows(
+        User, Image, Classification
+    )
+    
+    # Count classifications by stage
+    classifications_by_stage = Classification.objects.values('stage').annotate(
+        count=Count('stage')
+    ).order_by('stage')
+    
+    # Format stage counts
+    stage_counts = {}
+    for item in classifications_by_stage:
+        stage_counts[item['stage']] = item['count']
+    
+    # Count users by specialty
+    users_by_specialty = User.objects.exclude(
+        specialty__isnull=True
+    ).exclude(
+        specialty__exact=''
+    ).values('specialty').annotate(
+        count=Count('specialty')
+    ).order_by('specialty')
+    
+    specialty_counts = {}
+    for item in users_by_specialty:
+        specialty_counts[item['specialty']] = item['count']
+    
+    return {
+        'total_users': total_users,
+        'total_images': total_images,
+        'total_classifications': total_classifications,
+        'classifications_by_stage': stage_counts,
+        'users_by_specialty': specialty_counts,
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds')
+    }
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
 @jwt_required_admin
@@ -57,50 +157,12 @@ def get_metrics(request):
     """
     GET /admin/metrics/
     Returns system metrics for administrators
+    (cached for METRICS_CACHE_TIMEOUT seconds; see generated_at)
     """
     try:
-        # Count total users
-        total_users = User.objects.count()
-        
-        # Count total images
-        total_images = Image.objects.count()
-        
-        # Count total classifications
-        total_classifications = Classification.objects.count()
-        
-        # Count classifications by stage
-        classifications_by_stage = Classification.objects.values('stage').annotate(
-            count=Count('stage')
-        ).order_by('stage')
-        
-        # Format stage counts
-        stage_counts = {}
-        for item in classifications_by_stage:
-            stage_counts[item['stage']] = item['count']
+        metrics = cache.get_or_set(METRICS_CACHE_KEY, _compute_metrics, METRICS_CACHE_TIMEOUT)
         
-        # Count users by specialty
-        users_by_specialty = User.objects.exclude(
-            specialty__isnull=True
-        ).exclude(
-            specialty__exact=''
-        ).values('specialty').annotate(
-            count=Count('specialty')
-        ).order_by('specialty')
-        
-        specialty_counts = {}
-        for item in users_by_specialty:
-            specialty_counts[item['specialty']] = item['count']
-        
-        metrics = {
-            'total_users': total_users,
-            'total_images': total_images,
-            'total_classifications': total_classifications,
-            'classifications_by_stage': stage_counts,
-            'users_by_specialty': specialty_counts,
-            'generated_at': datetime.now().isoformat()
-        }
-        
-        return JsonResponse(metrics, status=200)
+        return OrjsonResponse(metrics, status=200)
         
     except Exception as e:
         return JsonResponse({
@@ -114,35 +176,138 @@ def get_metrics(request):
 @jwt_required_admin
 def list_admin_users(request):
     """
-    GET /admin/users/
+    GET /admin/users/?page=1&page_size=50
     Returns list of all users for administrators
+    (one page of it when page or page_size is given)
     """
     try:
-        users = User.objects.all().order_by('-date_joined')
+        # Plain rows straight from the driver; no model instances or password hashes
+        users = User.objects.order_by('-date_joined').values_list(*ADMIN_USER_FIELDS)
         
-        users_data = []
-        for user in users:
-            user_data = {
-                'id': user.id,
-                'email': user.email,
-                'name': user.name,
-                'coren': user.coren,
-                'specialty': user.specialty,
-                'institution': user.institution,
-                'is_staff': user.is_staff,
-                'is_active': user.is_active,
-                'date_joined': user.date_joined.isoformat() if user.date_joined else None,
-                'last_login': user.last_login.isoformat() if user.last_login else None
+        page = request.GET.get('page')
+        page_size = request.GET.get('page_size')
+        pagination = {}
+        if page is not None or page_size is not None:
+            try:
+                page = int(page or 1)
+                page_size = int(page_size or ADMIN_USERS_PAGE_SIZE)
+                if page_size < 1 or page_size > ADMIN_USERS_MAX_PAGE_SIZE:
+                    raise ValueError(page_size)
+                paginator = Paginator(users, page_size)
+                users = paginator.page(page).object_list
+            except (ValueError, InvalidPage):
+                return JsonResponse({
+                    'message': 'Parâmetros de paginação inválidos',
+                    'errors': {'page': [f'page deve ser válido e page_size entre 1 e {ADMIN_USERS_MAX_PAGE_SIZE}']}
+                }, status=400)
+            pagination = {
+                'total_count': paginator.count,
+                'page': page,
+                'num_pages': paginator.num_pages
             }
-            users_data.append(user_data)
         
-        return JsonResponse({
+        # datetimes are serialized natively by OrjsonResponse
+        # (the User model has no institution column; keep the key for API consumers)
+        users_data = [
+            dict(zip(ADMIN_USER_FIELDS, row), institution=None)
+            for row in users.iterator(chunk_size=2000)
+        ]
+        
+        return OrjsonResponse({
             'users': users_data,
-            'total_count': len(users_data)
+            'total_count': len(users_data),
+            **pagination
         }, status=200)
         
     except Exception as e:
         return JsonResponse({
             'message': 'Erro interno do servidor',
             'errors': {'server': [str(e)]}
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@jwt_required_admin
+def register_users_bulk(request):
+    """
+    POST /admin/users/bulk/
+    Expected JSON: [{ name, email, password, coren, specialty }, ...]
+    Creates every user whose email is not registered yet, in one INSERT per batch
+    """
+    try:
+        try:
+            entries = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({'message': 'JSON inválido'}, status=400)
+        if not isinstance(entries, list) or not 0 < len(entries) <= BULK_REGISTER_MAX_USERS:
+            return JsonResponse({
+                'message': 'Dados inválidos',
+                'errors': {'users': [f'Envie uma lista com 1 a {BULK_REGISTER_MAX_USERS} usuários']}
+            }, status=400)
+        
+        # Validate everything before hashing anything
+        cleaned_entries = []
+        errors = {}
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                errors[str(index)] = {'user': ['Invalid user data']}
+                continue
+            cleaned, entry_errors = _validate_registration(entry)
+            if entry_errors:
+                errors[str(index)] = entry_errors
+            cleaned_entries.append(cleaned)
+        if errors:
+            return JsonResponse({'message': 'Validation failed', 'errors': errors}, status=400)
+        
+        # Drop emails that are already registered (or repeated in the list)
+        # so no time is spent hashing their passwords
+        emails = {cleaned['email'] for cleaned in cleaned_entries}
+        skipped = set(
+            User.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=emails)
+            .values_list('email_lower', flat=True)
+        )
+        new_entries = []
+        for cleaned in cleaned_entries:
+            if cleaned['email'] not in skipped:
+                skipped.add(cleaned['email'])
+                new_entries.append(cleaned)
+        
+        hashes = _get_hash_pool().map(make_password, [cleaned['password'] for cleaned in new_entries])
+        users = [
+            User(
+                email=cleaned['email'],
+                password=password_hash,
+                name=cleaned['name'],
+                coren=cleaned['coren'] or None,
+                specialty=cleaned['specialty'] or None,
+            )
+            for cleaned, password_hash in zip(new_entries, hashes)
+        ]
+        # A concurrent registration of the same email is skipped by the unique
+        # constraint rather than failing the whole batch
+        User.objects.bulk_create(users, batch_size=BULK_REGISTER_BATCH_SIZE, ignore_conflicts=True)
+        
+        # Every hash has its own salt, so a row holding our hash for the email is
+        # the one this request inserted; a row a concurrent request inserted first
+        # has another hash and is reported as skipped
+        our_hashes = {user.email: user.password for user in users}
+        created = [
+            {'id': row['id'], 'email': row['email']}
+            for row in User.objects.filter(email__in=our_hashes).order_by('id').values('id', 'email', 'password')
+            if our_hashes[row['email']] == row['password']
+        ]
+        created_emails = [row['email'] for row in created]
+        cache.delete_many([_auth_miss_key(email) for email in created_emails])
+        
+        return OrjsonResponse({
+            'created': created,
+            'skipped': sorted(emails.difference(created_emails)),
+        }, status=201)
+        
+    except Exception as e:
+        return JsonResponse({
+            'message': 'Erro interno do servidor',
+            'errors': {'server': [str(e)]}
+        }, status=500)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Import the URLconf and compile every route pattern at startup, so the
+        # first request a fresh worker serves does not pay for it
+        from django.urls import get_resolver
+        get_resolver().reverse_dict
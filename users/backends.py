@@ -0,0 +1,35 @@
+"""
+Authentication backends for the users app
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+# Columns needed to check a login; anything else is loaded on first access
+AUTH_FIELDS = ('id', 'password', 'is_active')
+
+
+class EmailBackend(ModelBackend):
+    """
+    ModelBackend that fetches only the columns needed to check credentials.
+    get_user is inherited unchanged, since request.user is read well beyond them.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.only(*AUTH_FIELDS).get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            # Run the hasher once anyway so a missing account takes as long as a wrong password
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,16 @@
+"""
+Password hashers for the users app
+"""
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with the OWASP 46 MiB profile (m=46 MiB, t=1, p=1).
+    Keeps the 'argon2' algorithm name, so hashes made with other parameters
+    still verify and are rehashed with these on the next successful login.
+    """
+    time_cost = 1
+    memory_cost = 46 * 1024
+    parallelism = 1
@@ -13,6 +13,16 @@ from users.views import verify_jwt_token
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Paths that skip JWT verification (a tuple so startswith checks them all in one call)
+_SKIP_PATHS = (
+    '/api/auth/login/',
+    '/api/auth/register/',
+    '/api/auth/verify-email-password/',
+    '/admin/',
+    '/media/',
+    '/static/',
+)
+
 
 class JWTAuthenticationMiddleware(MiddlewareMixin):
     """
@@ -28,18 +38,8 @@ class JWTAuthenticationMiddleware(MiddlewareMixin):
     def process_request(self, request):
         """Process incoming request to check for JWT token"""
         
-        # Skip JWT check for certain paths
-        skip_paths = [
-            '/api/auth/login/',
-            '/api/auth/register/',
-            '/api/auth/verify-email-password/',
-            '/admin/',
-            '/media/',
-            '/static/',
-        ]
-        
         # Check if current path should skip JWT verification
-        if any(request.path.startswith(path) for path in skip_paths):
+        if request.path.startswith(_SKIP_PATHS):
             return None
         
         # Get Authorization header
@@ -56,7 +56,7 @@ class JWTAuthenticationMiddleware(MiddlewareMixin):
             return None
         
         # Extract token
-        token = auth_header.split(' ')[1] if len(auth_header.split(' ')) == 2 else ''
+        token = auth_header[7:].strip()
         
         if not token:
             request.user = None
@@ -74,6 +74,9 @@ class JWTAuthenticationMiddleware(MiddlewareMixin):
         try:
             user = User.objects.get(id=user_id, is_active=True)
             request.user = user
+            # DRF views with authentication_classes([]) replace request.user with
+            # AnonymousUser; keep the verified user where decorators can still find it
+            request._jwt_user = user
             return None
         except User.DoesNotExist:
             request.user = None
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_specialty'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('specialty__isnull', False), models.Q(('specialty', ''), _negated=True)), fields=['specialty'], name='users_user_specialty_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Login looks users up by email and reads only these columns, so on PostgreSQL
+# the lookup can be answered from the index without visiting the table. Other
+# backends have no INCLUDE clause, and SQLite always prefers the unique email
+# index for this lookup, so they are left alone.
+CREATE_SQL = (
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS user_login_covering ON users_user (email) '
+    'INCLUDE (id, password, is_active, name, last_login)'
+)
+DROP_SQL = 'DROP INDEX CONCURRENTLY IF EXISTS user_login_covering'
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('users', '0008_user_user_email_ci_uniq'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
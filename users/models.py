@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 
 class CustomUserManager(BaseUserManager):
     """Custom user manager that uses email instead of username"""
@@ -37,6 +39,21 @@ class User(AbstractUser):
     
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Admin metrics group users by specialty, skipping empty values
+            models.Index(
+                fields=['specialty'],
+                name='users_user_specialty_idx',
+                condition=Q(specialty__isnull=False) & ~Q(specialty=''),
+            ),
+        ]
+        constraints = [
+            # Case variants of an address are the same account; registration
+            # relies on this instead of checking for the email first
+            models.UniqueConstraint(Lower('email'), name='user_email_ci_uniq'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.email})"
 
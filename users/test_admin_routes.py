@@ -1,24 +1,30 @@
 import json
 import jwt
 import os
-from django.test import TestCase, Client
+from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from images.models import Image
 from classification.models import Classification
+from users.admin_views import METRICS_CACHE_KEY
 
 User = get_user_model()
 
 class AdminRoutesTestCase(TestCase):
     """Test cases for admin routes"""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Resolve route URLs once for the whole class"""
+        cls.login_url = reverse('users:login_user')
+        cls.admin_metrics_url = reverse('admin_metrics')
+        cls.admin_users_url = reverse('admin_users')
+    
     def setUp(self):
         """Set up test data"""
-        self.client = Client()
-        
-        # URLs
-        self.admin_metrics_url = reverse('admin_metrics')
-        self.admin_users_url = reverse('admin_users')
+        # Metrics are cached between requests; start every test from fresh counts
+        cache.delete(METRICS_CACHE_KEY)
         
         # Create admin user
         self.admin_user = User.objects.create_user(
@@ -49,7 +55,7 @@ class AdminRoutesTestCase(TestCase):
         }
         
         admin_login_response = self.client.post(
-            reverse('users:login_user'),
+            self.login_url,
             data=json.dumps(admin_login_data),
             content_type='application/json'
         )
@@ -64,7 +70,7 @@ class AdminRoutesTestCase(TestCase):
         }
         
         regular_login_response = self.client.post(
-            reverse('users:login_user'),
+            self.login_url,
             data=json.dumps(regular_login_data),
             content_type='application/json'
         )
@@ -1,7 +1,7 @@
 import json
 import jwt
 import os
-from django.test import TestCase, Client
+from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.conf import settings
@@ -11,13 +11,21 @@ User = get_user_model()
 class UserRoutesTestCase(TestCase):
     """Test cases for user authentication routes"""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Resolve route URLs and create the login user once for the whole class"""
+        cls.register_url = reverse('users:register_user')
+        cls.login_url = reverse('users:login_user')
+        cls.verify_token_url = reverse('users:verify_token')
+        
+        cls.existing_user = User.objects.create_user(
+            email='existing@example.com',
+            password='existingpass123',
+            coren='654321',
+        )
+    
     def setUp(self):
         """Set up test data"""
-        self.client = Client()
-        self.register_url = reverse('users:register_user')
-        self.login_url = reverse('users:login_user')
-        self.verify_token_url = reverse('users:verify_token')
-        
         # Test user data
         self.user_data = {
             'email': 'test@example.com',
@@ -25,13 +33,6 @@ class UserRoutesTestCase(TestCase):
             'name': 'Test User',
             'coren': '123456',
         }
-        
-        # Create a test user for login tests
-        self.existing_user = User.objects.create_user(
-            email='existing@example.com',
-            password='existingpass123',
-            coren='654321',
-        )
     
     def test_user_registration_success(self):
         """Test successful user registration"""
@@ -1,9 +1,12 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
 from django.core.exceptions import ValidationError
 from django.conf import settings
 import json
+from unittest import skipUnless
+
+from users.views import CACHETOOLS_AVAILABLE, EMAIL_VALIDATOR_AVAILABLE
 
 User = get_user_model()
 
@@ -56,7 +59,14 @@ class UserModelTest(TestCase):
                 email=self.user_data['email'],
                 password='anotherpass123'
             )
-    
+
+    def test_user_email_unique_ignores_case(self):
+        """Test that emails differing only in case are rejected"""
+        User.objects.create_user(email='Case@example.com', password='testpass123')
+
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user(email='case@example.com', password='anotherpass123')
+
     def test_user_string_representation(self):
         """Test the string representation of user"""
         user = User.objects.create_user(
@@ -90,15 +100,8 @@ class UserModelTest(TestCase):
         self.assertEqual(UserModel._meta.model_name, 'user')
 
 
-class EmailValidationTest(TestCase):
-    
-    def setUp(self):
-        from django.test import Client
-        self.client = Client()
-        self.valid_user = User.objects.create_user(
-            email='valid@example.com',
-            password='validpass123'
-        )
+class EmailFormatValidationTest(SimpleTestCase):
+    """Unit tests for validate_email_format, which never touches the database"""
     
     def test_validate_email_format_function(self):
         """Test the validate_email_format function directly"""
@@ -113,7 +116,7 @@ class EmailValidationTest(TestCase):
         ]
         
         for email in valid_emails:
-            is_valid, message = validate_email_format(email)
+            is_valid, message, normalized = validate_email_format(email)
             self.assertTrue(is_valid, f"Email {email} should be valid: {message}")
     
     def test_validate_email_format_invalid_emails(self):
@@ -141,8 +144,57 @@ class EmailValidationTest(TestCase):
         ]
         
         for email in invalid_emails:
-            is_valid, message = validate_email_format(email)
+            is_valid, message, normalized = validate_email_format(email)
             self.assertFalse(is_valid, f"Email {email} should be invalid but was considered valid")
+
+    @skipUnless(EMAIL_VALIDATOR_AVAILABLE, 'email_validator is not installed')
+    def test_validate_email_format_runs_email_validator(self):
+        """Addresses the pattern accepts are still checked by email_validator, without DNS"""
+        from unittest import mock
+        from users.views import validate_email_format
+
+        is_valid, message, normalized = validate_email_format('user@example.invalid')
+        self.assertFalse(is_valid)
+        self.assertTrue(message.startswith('Invalid email:'), message)
+
+        with mock.patch('users.views.validate_email_advanced') as validate_email_advanced:
+            validate_email_format('uncached@example.com')
+        validate_email_advanced.assert_called_once_with('uncached@example.com', check_deliverability=False)
+
+    def test_validate_email_format_reuses_cached_result(self):
+        """Repeated validation of the same normalized email is served from the cache"""
+        from users.views import validate_email_format, _validate_email_syntax
+
+        validate_email_format('cached@example.com')
+        hits = _validate_email_syntax.cache_info().hits
+        is_valid, message, normalized = validate_email_format('  Cached@Example.com ')
+
+        self.assertTrue(is_valid, message)
+        self.assertEqual(normalized, 'cached@example.com')
+        self.assertEqual(_validate_email_syntax.cache_info().hits, hits + 1)
+
+    def test_validate_email_format_already_normalized(self):
+        """Normalized input is validated as given when already_normalized is set"""
+        from users.views import validate_email_format, _normalize_email
+
+        email = _normalize_email('  Norm@Example.com ')
+        self.assertEqual(email, 'norm@example.com')
+        self.assertEqual(
+            validate_email_format(email, already_normalized=True),
+            validate_email_format('  Norm@Example.com ')
+        )
+        self.assertEqual(_normalize_email(None), '')
+
+
+class EmailValidationTest(TestCase):
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Create the user once for the whole class"""
+        cls.valid_user = User.objects.create_user(
+            email='valid@example.com',
+            password='validpass123'
+        )
     
     def test_email_validation_in_login_view(self):
         """Test email validation in the login API endpoint"""
@@ -224,7 +276,7 @@ class EmailValidationTest(TestCase):
         self.assertEqual(data['user_id'], test_user.id)
 
 
-class PasswordValidationTest(TestCase):
+class PasswordValidationTest(SimpleTestCase):
     """Test cases for password validation"""
     
     def test_validate_password_strength_function(self):
@@ -262,14 +314,36 @@ class PasswordValidationTest(TestCase):
             self.assertFalse(is_valid, f"Password '{password}' should be invalid but was considered valid")
 
 
+class RegistrationValidationTest(SimpleTestCase):
+    """Test cases for the registration validation helper"""
+
+    def test_cleans_fields(self):
+        """Test that fields are stripped and the email lowercased"""
+        from users.views import _validate_registration
+
+        cleaned, errors = _validate_registration({
+            'name': ' Test User ',
+            'email': ' Test@Example.com ',
+            'password': 'testpass123',
+            'specialty': ' Nursing ',
+        })
+        self.assertEqual(errors, {})
+        self.assertEqual(cleaned['name'], 'Test User')
+        self.assertEqual(cleaned['email'], 'test@example.com')
+        self.assertEqual(cleaned['coren'], '')
+        self.assertEqual(cleaned['specialty'], 'Nursing')
+
+    def test_reports_missing_fields(self):
+        """Test that every missing required field is reported"""
+        from users.views import _validate_registration
+
+        cleaned, errors = _validate_registration({'name': '   '})
+        self.assertEqual(set(errors), {'name', 'email', 'password', 'specialty'})
+
+
 class GoogleSSOValidationTest(TestCase):
     """Test cases for Google SSO validation"""
     
-    def setUp(self):
-        """Set up test client"""
-        from django.test import Client
-        self.client = Client()
-    
     def test_google_sso_missing_token(self):
         """Test Google SSO with missing token"""
         import json
@@ -322,15 +396,14 @@ class GoogleSSOValidationTest(TestCase):
 class ViewsIntegrationTest(TestCase):
     """Integration tests for all authentication views"""
     
-    def setUp(self):
-        """Set up test data"""
-        from django.test import Client
-        self.client = Client()
-        self.user_data = {
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the whole class"""
+        cls.user_data = {
             'email': 'integration@example.com',
             'password': 'integration123'
         }
-        self.user = User.objects.create_user(**self.user_data)
+        cls.user = User.objects.create_user(**cls.user_data)
     
     def test_complete_email_password_flow(self):
         """Test complete email/password authentication flow"""
@@ -381,3 +454,451 @@ class ViewsIntegrationTest(TestCase):
         data = json.loads(response.content)
         self.assertFalse(data['success'])
         self.assertIn('Invalid JSON', data['error'])
+
+
+class AdminMetricsQueryTest(TestCase):
+    """Guard the query shape of the admin metrics totals"""
+    
+    def test_count_rows_single_plain_count_query(self):
+        """Test that the metric totals are one query of plain COUNT(*) subqueries"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from images.models import Image
+        from classification.models import Classification
+        from users.admin_views import count_rows
+        
+        User.objects.create_user(email='counted@example.com', password='countpass123')
+        
+        with CaptureQueriesContext(connection) as queries:
+            counts = count_rows(User, Image, Classification)
+        
+        self.assertEqual(tuple(counts), (1, 0, 0))
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]['sql']
+        self.assertTrue(sql.startswith('SELECT (SELECT COUNT(*) FROM'), sql)
+        self.assertNotIn('GROUP BY', sql)
+
+
+class AuthMissCacheTest(TestCase):
+    """Test verify_email_password's unknown-email cache and query counts (the view is called directly)"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from django.test import RequestFactory
+        from users.views import _auth_miss_key
+        
+        self.factory = RequestFactory()
+        cache.delete(_auth_miss_key('ghost@example.com'))
+    
+    def verify(self, email, password):
+        from users.views import verify_email_password
+        
+        request = self.factory.post(
+            '/users/verify-email-password/',
+            data=json.dumps({'email': email, 'password': password}),
+            content_type='application/json'
+        )
+        return json.loads(verify_email_password(request).content)
+    
+    def test_unknown_email_answered_from_cache(self):
+        """Test that a repeated attempt for an unknown email skips the database"""
+        self.assertFalse(self.verify('ghost@example.com', 'ghostpass123')['success'])
+        
+        with self.assertNumQueries(0):
+            data = self.verify('ghost@example.com', 'ghostpass123')
+        self.assertFalse(data['success'])
+        self.assertIn('credential invalid', data['message'])
+    
+    def test_cached_unknown_email_still_hashes(self):
+        """Test that a cached miss runs the hasher, so its timing matches a wrong password"""
+        from unittest import mock
+        
+        self.assertFalse(self.verify('ghost@example.com', 'ghostpass123')['success'])
+        
+        with mock.patch('django.contrib.auth.base_user.make_password') as make_password:
+            make_password.return_value = 'md5$salt$hash'
+            self.assertFalse(self.verify('ghost@example.com', 'ghostpass123')['success'])
+        make_password.assert_called_once_with('ghostpass123')
+    
+    def test_wrong_password_not_cached(self):
+        """Test that a mistyped password can be retried immediately"""
+        User.objects.create_user(email='ghost@example.com', password='ghostpass123')
+        
+        self.assertFalse(self.verify('ghost@example.com', 'wrongpass123')['success'])
+        self.assertTrue(self.verify('ghost@example.com', 'ghostpass123')['success'])
+    
+    def test_successful_verification_query_count(self):
+        """Test that a successful verification is a single user lookup"""
+        User.objects.create_user(email='ghost@example.com', password='ghostpass123')
+        
+        with self.assertNumQueries(1):
+            data = self.verify('ghost@example.com', 'ghostpass123')
+        self.assertTrue(data['success'])
+    
+    def test_unknown_email_query_count(self):
+        """Test that a first attempt for an unknown email is a single user lookup"""
+        with self.assertNumQueries(1):
+            data = self.verify('ghost@example.com', 'ghostpass123')
+        self.assertFalse(data['success'])
+    
+    def test_registration_clears_cached_miss(self):
+        """Test that registering an email clears its cached miss"""
+        from django.urls import reverse
+        
+        self.assertFalse(self.verify('ghost@example.com', 'ghostpass123')['success'])
+        
+        response = self.client.post(
+            reverse('users:register_user'),
+            data=json.dumps({
+                'email': 'ghost@example.com',
+                'password': 'ghostpass123',
+                'name': 'Ghost User',
+            }),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(self.verify('ghost@example.com', 'ghostpass123')['success'])
+
+
+class EmailBackendTest(TestCase):
+    """Test the column-restricted login lookup of users.backends.EmailBackend"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='backend@example.com', password='backendpass123')
+    
+    def test_authenticate_loads_only_login_columns(self):
+        """Test that authenticate fetches id, password and is_active in one query"""
+        from django.contrib.auth import authenticate
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as queries:
+            user = authenticate(None, username='backend@example.com', password='backendpass123')
+        
+        self.assertEqual(user, self.user)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('email', user.get_deferred_fields())
+    
+    def test_authenticate_rejects_wrong_password(self):
+        """Test that a wrong password or unknown email returns None"""
+        from django.contrib.auth import authenticate
+        
+        self.assertIsNone(authenticate(None, username='backend@example.com', password='wrongpass123'))
+        self.assertIsNone(authenticate(None, username='nobody@example.com', password='backendpass123'))
+
+
+@skipUnless(CACHETOOLS_AVAILABLE, 'cachetools is not installed')
+class JWTEncodingTest(SimpleTestCase):
+    """Test the HS256 encoder and decoder used for issued tokens"""
+    
+    def test_matches_pyjwt(self):
+        """Test that tokens are byte-identical to jwt.encode and decode with it"""
+        import jwt
+        from skinrest.responses import ORJSON_AVAILABLE
+        from users.views import _encode_jwt, _JWT_SECRET
+        
+        payload = {'user_id': 7, 'email': 'jwt@example.com', 'exp': 4102444800, 'iat': 1700000000, 'type': 'access'}
+        token = _encode_jwt(payload)
+        
+        self.assertEqual(jwt.decode(token, _JWT_SECRET, algorithms=['HS256']), payload)
+        if ORJSON_AVAILABLE:
+            self.assertEqual(token, jwt.encode(payload, _JWT_SECRET, algorithm='HS256'))
+    
+    def test_decode_rejects_like_pyjwt(self):
+        """Test that the inline decoder raises for bad signatures and expired tokens"""
+        import time
+        import jwt
+        from users.views import _decode_jwt, _encode_jwt, _JWT_SECRET
+        
+        now = int(time.time())
+        token = _encode_jwt({'user_id': 7, 'exp': now + 60, 'iat': now})
+        self.assertEqual(_decode_jwt(token, _JWT_SECRET)['user_id'], 7)
+        
+        with self.assertRaises(jwt.InvalidSignatureError):
+            _decode_jwt(token, 'another-secret')
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            _decode_jwt(_encode_jwt({'user_id': 7, 'exp': now - 1}), _JWT_SECRET)
+        with self.assertRaises(jwt.InvalidAlgorithmError):
+            _decode_jwt(jwt.encode({'user_id': 7}, _JWT_SECRET, algorithm='HS512'), _JWT_SECRET)
+
+
+class TokenUserCacheTest(TestCase):
+    """Test the short-lived user cache behind verify_token"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        from django.urls import reverse
+        from users.views import generate_jwt_tokens
+        
+        cls.verify_token_url = reverse('users:verify_token')
+        cls.user = User.objects.create_user(email='tokenuser@example.com', password='tokenpass123')
+        cls.token, _ = generate_jwt_tokens(cls.user)
+    
+    def setUp(self):
+        from users.views import forget_token_user
+        forget_token_user(self.user.id)
+    
+    def verify(self):
+        return self.client.post(
+            self.verify_token_url,
+            data=json.dumps({'token': self.token}),
+            content_type='application/json'
+        )
+    
+    def test_repeated_verification_skips_database(self):
+        """Test that a second verification of the same token runs no query"""
+        self.assertEqual(self.verify().status_code, 200)
+        
+        with self.assertNumQueries(0):
+            response = self.verify()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['email'], 'tokenuser@example.com')
+    
+    def test_login_clears_cached_user(self):
+        """Test that logging in drops the cached user so it is read again"""
+        from django.urls import reverse
+        
+        self.verify()
+        self.client.post(
+            reverse('users:login_user'),
+            data=json.dumps({'email': 'tokenuser@example.com', 'password': 'tokenpass123'}),
+            content_type='application/json'
+        )
+        
+        with self.assertNumQueries(1):
+            self.verify()
+
+
+class LastLoginUpdateTest(TestCase):
+    """Test that login_user only rewrites a stale last_login"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        from django.urls import reverse
+        
+        cls.login_url = reverse('users:login_user')
+        cls.user = User.objects.create_user(email='lastlogin@example.com', password='lastlogin123')
+    
+    def login(self):
+        return self.client.post(
+            self.login_url,
+            data=json.dumps({'email': 'lastlogin@example.com', 'password': 'lastlogin123'}),
+            content_type='application/json'
+        )
+    
+    def test_repeated_login_skips_last_login_write(self):
+        """Test that a second login within the interval only reads the user"""
+        with self.assertNumQueries(2):
+            self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(self.login().status_code, 200)
+    
+    def test_stale_last_login_is_updated(self):
+        """Test that a last_login older than the interval is rewritten"""
+        from datetime import timedelta
+        from django.utils import timezone
+        
+        stale = timezone.now() - timedelta(hours=1)
+        User.objects.filter(pk=self.user.pk).update(last_login=stale)
+        
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertGreater(self.user.last_login, stale)
+
+
+class LoginRateLimitTest(TestCase):
+    """Test that repeated failed login attempts are refused before the password check"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        from django.urls import reverse
+        
+        cls.login_url = reverse('users:login_user')
+        User.objects.create_user(email='limited@example.com', password='limited123')
+    
+    def setUp(self):
+        from unittest import mock
+        from users import views
+        
+        for patcher in (
+            mock.patch.object(views, '_login_attempts', {}),
+            mock.patch.object(views, 'LOGIN_ATTEMPT_LIMIT', 2),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def login(self, password, ip='127.0.0.1', **extra):
+        return self.client.post(
+            self.login_url,
+            data=json.dumps({'email': 'Limited@example.com', 'password': password}),
+            content_type='application/json',
+            REMOTE_ADDR=ip,
+            **extra
+        )
+    
+    def test_attempts_past_limit_get_429(self):
+        """Test that the attempt after the limit is refused without touching the database"""
+        self.assertEqual(self.login('wrongpass123').status_code, 401)
+        self.assertEqual(self.login('wrongpass123').status_code, 401)
+        
+        with self.assertNumQueries(0):
+            response = self.login('limited123')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+    
+    def test_limit_is_per_client_ip(self):
+        """Test that another client IP still gets its own attempts"""
+        for _ in range(3):
+            self.login('wrongpass123')
+        
+        self.assertEqual(self.login('limited123', ip='10.0.0.2').status_code, 200)
+    
+    def test_successful_logins_are_not_counted(self):
+        """Test that logging in more often than the limit is never refused"""
+        for _ in range(3):
+            self.assertEqual(self.login('limited123').status_code, 200)
+    
+    def test_success_clears_failed_attempts(self):
+        """Test that a successful login resets the count of failed ones"""
+        self.assertEqual(self.login('wrongpass123').status_code, 401)
+        self.assertEqual(self.login('limited123').status_code, 200)
+        self.assertEqual(self.login('wrongpass123').status_code, 401)
+        
+        self.assertEqual(self.login('limited123').status_code, 200)
+    
+    def test_limit_is_per_forwarded_client_ip(self):
+        """Test that clients behind the same proxy are told apart by X-Forwarded-For"""
+        for _ in range(3):
+            self.login('wrongpass123', ip='10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.5, 198.51.100.7')
+        self.assertEqual(
+            self.login('limited123', ip='10.0.0.1', HTTP_X_FORWARDED_FOR='198.51.100.7').status_code, 429
+        )
+        
+        response = self.login('limited123', ip='10.0.0.1', HTTP_X_FORWARDED_FOR='198.51.100.8')
+        self.assertEqual(response.status_code, 200)
+
+
+class GetAllUsersTest(TestCase):
+    """Test the streamed, cursor-paginated get_all_users view (called directly)"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth.hashers import make_password
+        
+        password = make_password('listpass123')
+        cls.users = User.objects.bulk_create([
+            User(email=f'list{i}@example.com', password=password) for i in range(3)
+        ])
+    
+    def get(self, **params):
+        from django.test import RequestFactory
+        from users.views import get_all_users
+        
+        return get_all_users(RequestFactory().get('/users/all/', params))
+    
+    def test_pages_follow_next_cursor(self):
+        """Test that pages are streamed in id order and chained through next_cursor"""
+        response = self.get(limit=2)
+        self.assertTrue(response.streaming)
+        first = json.loads(b''.join(response.streaming_content))
+        self.assertTrue(first['success'])
+        self.assertEqual([u['email'] for u in first['users']], ['list0@example.com', 'list1@example.com'])
+        self.assertEqual(first['next_cursor'], self.users[1].id)
+        
+        second = json.loads(b''.join(self.get(cursor=first['next_cursor'], limit=2).streaming_content))
+        self.assertEqual([u['email'] for u in second['users']], ['list2@example.com'])
+        self.assertIsNone(second['next_cursor'])
+    
+    def test_columnar_format(self):
+        """Test that format=columns lists field names once and users as value arrays"""
+        from users.views import USER_LIST_FIELDS
+        
+        data = json.loads(b''.join(self.get(limit=2, format='columns').streaming_content))
+        self.assertEqual(data['columns'], list(USER_LIST_FIELDS))
+        self.assertEqual([row[:2] for row in data['rows']], [
+            [self.users[0].id, 'list0@example.com'],
+            [self.users[1].id, 'list1@example.com'],
+        ])
+        self.assertNotIn('users', data)
+        self.assertEqual(data['next_cursor'], self.users[1].id)
+    
+    def test_invalid_limit(self):
+        """Test that an out-of-range limit is rejected"""
+        response = self.get(limit=0)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(json.loads(response.content)['success'])
+
+
+class BulkRegisterTest(TestCase):
+    """Test the admin bulk registration endpoint"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        import jwt
+        from django.urls import reverse
+        from users.admin_views import _JWT_SECRET
+        
+        cls.url = reverse('admin_users_bulk')
+        admin = User.objects.create_user(email='bulkadmin@example.com', password='adminpass123', is_staff=True)
+        token = jwt.encode({'user_id': admin.id}, _JWT_SECRET, algorithm='HS256')
+        cls.headers = {'Authorization': f'Bearer {token}'}
+        User.objects.create_user(email='Taken@example.com', password='takenpass123')
+    
+    def post(self, data):
+        return self.client.post(self.url, data=json.dumps(data), content_type='application/json', headers=self.headers)
+    
+    def test_creates_new_users_and_skips_existing(self):
+        """Test that new emails are created once and registered ones skipped"""
+        response = self.post([
+            {'name': 'Bulk One', 'email': 'bulk1@example.com', 'password': 'bulkpass123', 'specialty': 'Nursing'},
+            {'name': 'Bulk Two', 'email': 'BULK2@example.com', 'password': 'bulkpass456'},
+            {'name': 'Bulk Again', 'email': 'bulk1@example.com', 'password': 'bulkpass789'},
+            {'name': 'Taken', 'email': 'taken@example.com', 'password': 'takenpass456'},
+        ])
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual([u['email'] for u in data['created']], ['bulk1@example.com', 'bulk2@example.com'])
+        self.assertEqual(data['skipped'], ['taken@example.com'])
+        
+        user = User.objects.get(email='bulk1@example.com')
+        self.assertEqual(user.name, 'Bulk One')
+        self.assertTrue(user.check_password('bulkpass123'))
+    
+    def test_concurrent_insert_reported_as_skipped(self):
+        """Test that a row another request inserts after the pre-check is not reported as created"""
+        from unittest import mock
+        
+        class RacingPool:
+            def map(self, fn, passwords):
+                User.objects.create_user(email='race@example.com', password='racerpass123')
+                return map(fn, passwords)
+        
+        with mock.patch('users.admin_views._get_hash_pool', return_value=RacingPool()):
+            response = self.post([
+                {'name': 'Bulk One', 'email': 'bulk1@example.com', 'password': 'bulkpass123'},
+                {'name': 'Race', 'email': 'race@example.com', 'password': 'racepass456'},
+            ])
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual([u['email'] for u in data['created']], ['bulk1@example.com'])
+        self.assertEqual(data['skipped'], ['race@example.com'])
+        self.assertTrue(User.objects.get(email='race@example.com').check_password('racerpass123'))
+    
+    def test_invalid_entry_rejects_batch(self):
+        """Test that one invalid entry rejects the whole list"""
+        response = self.post([
+            {'name': 'Bulk One', 'email': 'bulk1@example.com', 'password': 'bulkpass123'},
+            {'name': 'No Email', 'password': 'bulkpass456'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.json()['errors']['1'])
+        self.assertFalse(User.objects.filter(email='bulk1@example.com').exists())
+    
+    def test_requires_admin_token(self):
+        """Test that the endpoint rejects requests without a token"""
+        response = self.client.post(self.url, data='[]', content_type='application/json')
+        self.assertEqual(response.status_code, 401)
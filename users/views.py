@@ -1,24 +1,27 @@
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.contrib.auth import authenticate
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.views.decorators.http import require_http_methods
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import AllowAny
 from django.contrib.auth.hashers import check_password
-from django.core.validators import validate_email
-from django.core.exceptions import ValidationError
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema, OpenApiResponse
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from datetime import datetime, timedelta
+from functools import lru_cache
 import jwt
 import json
+import base64
+import hashlib
+import hmac
 import logging
 import re
+import threading
+import time
 
 try:
     from email_validator import validate_email as validate_email_advanced, EmailNotValidError
@@ -26,10 +29,25 @@ try:
 except ImportError:
     EMAIL_VALIDATOR_AVAILABLE = False
 
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+from skinrest.responses import OrjsonResponse, dumps, loads as json_loads
+
+from .backends import AUTH_FIELDS
 from .models import User
 
 logger = logging.getLogger(__name__)
 
+# Secret and algorithm of the tokens issued and checked here, resolved once since
+# settings do not change at runtime
+_JWT_SECRET = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
+_JWT_ALG = 'HS256'
+_JWT_SECRET_BYTES = _JWT_SECRET.encode()
+
 class UserResponseSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     name = serializers.CharField()
@@ -58,89 +76,214 @@ class VerifyTokenResponseSerializer(serializers.Serializer):
     message = serializers.CharField()
     user = serializers.DictField(required=False)
 
-def validate_email_format(email):
+# Patterns for validate_email_format and validate_password_strength, compiled once at import
+_EMAIL_RE = re.compile(
+    r'^[a-zA-Z0-9._%+-]+@'
+    r'(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,63}$'
+)
+_HAS_DIGIT = re.compile(r'\d').search
+
+# ASCII byte sets scanned by validate_password_strength; UTF-8 continuation bytes never match them
+_ASCII_DIGITS = frozenset(b'0123456789')
+_ASCII_LETTERS = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+# Validation messages, shared by the validators and the views that report them
+_ERR_EMAIL_REQUIRED = "Email is required"
+_ERR_EMAIL_NOT_STRING = "Email must be a string"
+_ERR_EMAIL_TOO_SHORT = "Email too short"
+_ERR_EMAIL_TOO_LONG = "Email too long"
+_ERR_EMAIL_AT = "Email must contain exactly one @ symbol"
+_ERR_EMAIL_LOCAL_LENGTH = "Invalid email local part length"
+_ERR_EMAIL_DOMAIN_LENGTH = "Invalid email domain length"
+_ERR_EMAIL_DOMAIN_DOT = "Domain must contain at least one dot"
+_ERR_EMAIL_CONSECUTIVE_DOTS = "Email cannot contain consecutive dots"
+_ERR_EMAIL_EDGE_DOT = "Email cannot start or end with a dot"
+_ERR_EMAIL_LOCAL_TRAILING_DOT = "Email local part cannot end with a dot"
+_ERR_EMAIL_PATTERN = "Email format does not match required pattern"
+_MSG_EMAIL_VALID = "Valid email format"
+_ERR_PASSWORD_REQUIRED = "Password is required"
+_ERR_PASSWORD_TOO_SHORT = "Password must be at least 8 characters long"
+_ERR_PASSWORD_TOO_LONG = "Password too long (max 128 characters)"
+_ERR_PASSWORD_DIGIT = "Password must contain at least one digit"
+_ERR_PASSWORD_LETTER = "Password must contain at least one letter"
+_MSG_PASSWORD_VALID = "Valid password strength"
+_ERR_NAME_REQUIRED = "Name is required"
+_ERR_SPECIALTY_REQUIRED = "Specialty is required"
+
+def _normalize_email(email):
+    """Strip and lowercase an email the way every auth view stores and looks it up"""
+    return email.strip().lower() if email else ''
+
+def validate_email_format(email, *, already_normalized=False):
+    """
+    Validate an email address.
+    Returns (is_valid, message, normalized_email); normalized_email is None for non-string input.
+    Pass already_normalized=True when email came from _normalize_email to skip doing it again.
+    """
     if not email:
-        return False, "Email is required"
+        return False, _ERR_EMAIL_REQUIRED, None
     
     if not isinstance(email, str):
-        return False, "Email must be a string"
+        return False, _ERR_EMAIL_NOT_STRING, None
     
-    email = email.strip().lower()
+    if not already_normalized:
+        email = _normalize_email(email)
 
-    try:
-        validate_email(email)
-    except ValidationError:
-        return False, "Invalid email format"
-    
-    if EMAIL_VALIDATOR_AVAILABLE:
-        try:
-            validated_email = validate_email_advanced(
-                email,
-                check_deliverability=False
-            )
-            email = validated_email.email
-        except EmailNotValidError as e:
-            return False, f"Invalid email: {str(e)}"
-    
+    # Length checks stay outside the cache so oversized input never becomes a key
     if len(email) < 5:
-        return False, "Email too short"
+        return False, _ERR_EMAIL_TOO_SHORT, email
     
     if len(email) > 254:
-        return False, "Email too long"
+        return False, _ERR_EMAIL_TOO_LONG, email
 
-    if email.count('@') != 1:
-        return False, "Email must contain exactly one @ symbol"
-    
-    local_part, domain = email.split('@')
+    is_valid, message = _validate_email_syntax(email)
+    if not is_valid:
+        return is_valid, message, email
+
+    return True, _MSG_EMAIL_VALID, email
+
+@lru_cache(maxsize=4096)
+def _validate_email_syntax(email):
+    """
+    Pure syntax checks on a normalized email, memoized since the same
+    addresses are validated again on every login attempt
+    """
+    # One partition both splits the address and tells whether there was a single @
+    local_part, at, domain = email.partition('@')
+    if not at or '@' in domain:
+        return False, _ERR_EMAIL_AT
 
     if len(local_part) < 1 or len(local_part) > 64:
-        return False, "Invalid email local part length"
+        return False, _ERR_EMAIL_LOCAL_LENGTH
 
     if len(domain) < 1 or len(domain) > 253:
-        return False, "Invalid email domain length"
+        return False, _ERR_EMAIL_DOMAIN_LENGTH
 
     if '.' not in domain:
-        return False, "Domain must contain at least one dot"
+        return False, _ERR_EMAIL_DOMAIN_DOT
     
     if '..' in email:
-        return False, "Email cannot contain consecutive dots"
-    
-    if email.startswith('.') or email.endswith('.'):
-        return False, "Email cannot start or end with a dot"
+        return False, _ERR_EMAIL_CONSECUTIVE_DOTS
     
-    email_pattern = re.compile(
-        r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    )
-    
-    if not email_pattern.match(email):
-        return False, "Email format does not match required pattern"
+    if email[0] == '.' or email[-1] == '.':
+        return False, _ERR_EMAIL_EDGE_DOT
+
+    if local_part[-1] == '.':
+        return False, _ERR_EMAIL_LOCAL_TRAILING_DOT
     
-    return True, "Valid email format"
+    if not _EMAIL_RE.match(email):
+        return False, _ERR_EMAIL_PATTERN
+
+    # RFC checks without DNS lookups, so the result is still safe to memoize
+    if EMAIL_VALIDATOR_AVAILABLE:
+        try:
+            validate_email_advanced(email, check_deliverability=False)
+        except EmailNotValidError as e:
+            return False, f"Invalid email: {str(e)}"
+
+    return True, _MSG_EMAIL_VALID
 
 def validate_password_strength(password):
     if not password:
-        return False, "Password is required"
+        return False, _ERR_PASSWORD_REQUIRED
     
     if len(password) < 8:
-        return False, "Password must be at least 8 characters long"
+        return False, _ERR_PASSWORD_TOO_SHORT
     
     if len(password) > 128:
-        return False, "Password too long (max 128 characters)"
+        return False, _ERR_PASSWORD_TOO_LONG
     
-    if not re.search(r'\d', password):
-        return False, "Password must contain at least one digit"
+    # isdisjoint over the encoded bytes is a C loop that stops at the first hit
+    password_bytes = password.encode('utf-8', 'surrogatepass')
+
+    # \d also accepts non-ASCII digits, so keep the regex for that rare case
+    if _ASCII_DIGITS.isdisjoint(password_bytes) and (password.isascii() or not _HAS_DIGIT(password)):
+        return False, _ERR_PASSWORD_DIGIT
     
 
-    if not re.search(r'[a-zA-Z]', password):
-        return False, "Password must contain at least one letter"
+    if _ASCII_LETTERS.isdisjoint(password_bytes):
+        return False, _ERR_PASSWORD_LETTER
+    
+    return True, _MSG_PASSWORD_VALID
+
+def _b64encode(data):
+    """base64url without padding, as used in JWT segments"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+# Header segment shared by every token issued here; the same bytes jwt.encode
+# produces for HS256, so it is encoded once instead of on every call
+_JWT_HEADER_B64 = _b64encode(b'{"alg":"HS256","typ":"JWT"}')
+_JWT_HEADER_SEGMENT = _JWT_HEADER_B64.decode()
+
+
+def _encode_jwt(payload):
+    """Sign an HS256 token for payload, equivalent to jwt.encode with _JWT_SECRET"""
+    signing_input = _JWT_HEADER_B64 + b'.' + _b64encode(dumps(payload))
+    signature = hmac.new(_JWT_SECRET_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b'.' + _b64encode(signature)).decode()
+
+
+def _b64decode(segment):
+    """Decode an unpadded base64url JWT segment"""
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def _check_jwt_claims(payload):
+    """Apply the iat, nbf and exp checks jwt.decode runs by default"""
+    now = time.time()
+    for claim in ('iat', 'nbf', 'exp'):
+        if claim not in payload:
+            continue
+        try:
+            value = int(payload[claim])
+        except (ValueError, TypeError, OverflowError):
+            if claim == 'iat':
+                raise jwt.InvalidIssuedAtError('Issued At claim (iat) must be an integer.') from None
+            raise jwt.DecodeError(f'{claim} claim must be an integer.') from None
+        if claim == 'exp':
+            if value <= now:
+                raise jwt.ExpiredSignatureError('Signature has expired')
+        elif value > now:
+            raise jwt.ImmatureSignatureError(f'The token is not yet valid ({claim})')
+    if payload.get('aud'):
+        # No audience is ever expected here, same as jwt.decode without audience=
+        raise jwt.InvalidAudienceError('Invalid audience')
+
+
+def _decode_jwt(token, secret_key):
+    """
+    Verify an HS256 token and return its payload, like jwt.decode(algorithms=['HS256']).
+    Tokens with the header issued here are checked inline with one HMAC; any
+    other header is left to jwt.decode. Raises the same jwt exceptions.
+    """
+    signing_input, _, signature = token.rpartition('.')
+    header_segment, _, payload_segment = signing_input.partition('.')
+    if header_segment != _JWT_HEADER_SEGMENT:
+        return jwt.decode(token, secret_key, algorithms=[_JWT_ALG])
+    
+    # Compare encoded signatures, so only the canonical encoding is accepted
+    # (trailing padding aside, which jwt.decode tolerates too)
+    expected = _b64encode(
+        hmac.new(secret_key.encode(), signing_input.encode(), hashlib.sha256).digest()
+    )
+    if not hmac.compare_digest(expected, signature.rstrip('=').encode()):
+        raise jwt.InvalidSignatureError('Signature verification failed')
     
-    return True, "Valid password strength"
+    try:
+        payload = json_loads(_b64decode(payload_segment))
+    except ValueError as e:
+        raise jwt.DecodeError(f'Invalid payload string: {e}') from e
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError('Invalid payload string: must be a json object')
+    _check_jwt_claims(payload)
+    return payload
+
 
 def generate_jwt_tokens(user):
     """
     Generate access and refresh JWT tokens for a user
     """
-    import time
     current_time = int(time.time())
     
     # Token payload
@@ -160,26 +303,160 @@ def generate_jwt_tokens(user):
         'type': 'refresh'
     }
     
-    # Get secret key from settings (you should set this in your settings.py)
-    secret_key = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
-    
     # Generate tokens
-    access_token = jwt.encode(payload, secret_key, algorithm='HS256')
-    refresh_token = jwt.encode(refresh_payload, secret_key, algorithm='HS256')
+    access_token = _encode_jwt(payload)
+    refresh_token = _encode_jwt(refresh_payload)
     
     return access_token, refresh_token
 
+# Payloads of recently verified tokens, so a token reused within a few seconds
+# skips the HMAC check. Only successful decodes are stored.
+TOKEN_CACHE_TTL = 30
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL) if CACHETOOLS_AVAILABLE else None
+_token_cache_lock = threading.Lock()
+
+# Trimmed user dicts returned by verify_token, so a token checked again within a
+# few seconds skips the database as well as the signature check
+USER_CACHE_TTL = 15
+_user_cache = TTLCache(maxsize=4096, ttl=USER_CACHE_TTL) if CACHETOOLS_AVAILABLE else None
+_user_cache_lock = threading.Lock()
+
+def get_token_user(user_id):
+    """
+    Return the {id, email, first_name, last_name} dict verify_token reports for
+    user_id, or None if the user does not exist. Found users are cached for USER_CACHE_TTL seconds.
+    """
+    if _user_cache is not None:
+        with _user_cache_lock:
+            user_data = _user_cache.get(user_id)
+        if user_data is not None:
+            return user_data
+    
+    try:
+        user = User.objects.only('id', 'email', 'first_name', 'last_name').get(id=user_id)
+    except User.DoesNotExist:
+        return None
+    
+    user_data = {
+        'id': user.id,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name
+    }
+    if _user_cache is not None:
+        with _user_cache_lock:
+            _user_cache[user_id] = user_data
+    return user_data
+
+def forget_token_user(user_id):
+    """Drop the cached verify_token dict of user_id"""
+    if _user_cache is not None:
+        with _user_cache_lock:
+            _user_cache.pop(user_id, None)
+
+# login_user rewrites last_login at most this often per user
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(seconds=60)
+
+# Emails that verify_email_password recently found no account for. Repeated
+# attempts against them skip the user lookup; the password is still hashed so
+# the answer takes as long as a wrong password for an existing account.
+AUTH_MISS_CACHE_TIMEOUT = 5
+
+def _auth_miss_key(email):
+    return f'authmiss:{email}'
+
+# Failed login attempts per (client IP, email) in the current window. Once the
+# limit is reached further attempts are refused before the user lookup and the
+# password hasher, so a flood of guesses cannot make each worker spend its CPU
+# hashing them. A successful login clears the count.
+LOGIN_ATTEMPT_LIMIT = getattr(settings, 'LOGIN_ATTEMPT_LIMIT', 10)
+LOGIN_ATTEMPT_WINDOW = 60
+_login_attempts = TTLCache(maxsize=100000, ttl=LOGIN_ATTEMPT_WINDOW) if CACHETOOLS_AVAILABLE else None
+_login_attempts_lock = threading.Lock()
+
+def _client_ip(request):
+    """
+    Address of the client that sent request. Behind a proxy REMOTE_ADDR is the
+    proxy itself, so the last X-Forwarded-For entry (the one the proxy appended)
+    is used when CLIENT_IP_HEADER names that header.
+    """
+    header = getattr(settings, 'CLIENT_IP_HEADER', '')
+    forwarded = request.META.get(header) if header else None
+    if forwarded:
+        return forwarded.rsplit(',', 1)[-1].strip()
+    return request.META.get('REMOTE_ADDR')
+
+def _login_attempts_key(request, email):
+    return (_client_ip(request), hashlib.blake2b(email.encode(), digest_size=8).digest())
+
+def _login_rate_limited(key):
+    """True once LOGIN_ATTEMPT_LIMIT failed attempts were made for key in the window"""
+    if _login_attempts is None:
+        return False
+    with _login_attempts_lock:
+        counter = _login_attempts.get(key)
+        return counter is not None and counter[0] >= LOGIN_ATTEMPT_LIMIT
+
+def _login_failed(key):
+    """Count a failed login attempt for key"""
+    if _login_attempts is None:
+        return
+    with _login_attempts_lock:
+        # The counter is mutated in place, so the window runs from the first
+        # failure rather than being extended by each new one
+        counter = _login_attempts.get(key)
+        if counter is None:
+            counter = _login_attempts[key] = [0]
+        counter[0] += 1
+
+def _login_succeeded(key):
+    """Forget the failed attempts of key"""
+    if _login_attempts is None:
+        return
+    with _login_attempts_lock:
+        _login_attempts.pop(key, None)
+
+def _too_many_attempts(data):
+    response = OrjsonResponse(data, status=429)
+    response['Retry-After'] = str(LOGIN_ATTEMPT_WINDOW)
+    return response
+
+def decode_jwt_cached(token, secret_key):
+    """
+    Decode an HS256 JWT, reusing the payload of an identical token verified
+    in the last TOKEN_CACHE_TTL seconds. Raises the same jwt exceptions as jwt.decode.
+    """
+    # A JWS compact token is exactly three dot-separated segments; reject anything
+    # else before hashing, cache lookup or signature verification
+    if token.count('.') != 2:
+        raise jwt.DecodeError('Invalid number of segments')
+    
+    if _token_cache is None:
+        return _decode_jwt(token, secret_key)
+    
+    key = (secret_key, hashlib.blake2b(token.encode(), digest_size=16).digest())
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    
+    if payload is None:
+        payload = _decode_jwt(token, secret_key)
+        with _token_cache_lock:
+            _token_cache[key] = payload
+    elif payload.get('exp') is not None and payload['exp'] <= time.time():
+        # Never honor a cached token past its expiry
+        raise jwt.ExpiredSignatureError('Signature has expired')
+    
+    return payload
+
 def verify_jwt_token(token):
     """
     Verify and decode a JWT token
     Returns user_id if valid, None if invalid
     """
     try:
-        secret_key = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
-        payload = jwt.decode(token, secret_key, algorithms=['HS256'])
+        payload = decode_jwt_cached(token, _JWT_SECRET)
         
         # Check if token is expired (JWT library handles this automatically, but we can double check)
-        import time
         exp_timestamp = payload.get('exp')
         if exp_timestamp and exp_timestamp < time.time():
             return None, "Token expired"
@@ -198,61 +475,142 @@ def verify_jwt_token(token):
 @require_http_methods(["POST"])
 def verify_email_password(request):
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         email = data.get('email')
         password = data.get('password')
         
         if not email or not password:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'Email and password are required'
             }, status=400)
-        email_valid, email_error = validate_email_format(email)
+        email_valid, email_error, email = validate_email_format(email)
         if not email_valid:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': f'Invalid email: {email_error}'
             }, status=400)
-        email = email.strip().lower()
         
-        user = authenticate(request, username=email, password=password)
+        attempts_key = _login_attempts_key(request, email)
+        if _login_rate_limited(attempts_key):
+            return _too_many_attempts({
+                'success': False,
+                'error': 'Too many attempts, try again later'
+            })
         
-        if user is not None:
-            return JsonResponse({
+        miss_key = _auth_miss_key(email)
+        if cache.get(miss_key):
+            User().set_password(password)
+            _login_failed(attempts_key)
+            return OrjsonResponse({
+                'success': False,
+                'message': 'user credential invalid'
+            })
+        
+        # Same checks as EmailBackend, without authenticate()'s backend loop and signals
+        try:
+            user = User.objects.only(*AUTH_FIELDS).get(email=email)
+        except User.DoesNotExist:
+            # Hash anyway so an unknown email takes as long as a wrong password.
+            # Only a missing account is remembered; a mistyped password must be retryable at once
+            User().set_password(password)
+            cache.set(miss_key, 1, timeout=AUTH_MISS_CACHE_TIMEOUT)
+            user = None
+        
+        if user is not None and user.is_active and user.check_password(password):
+            _login_succeeded(attempts_key)
+            return OrjsonResponse({
                 'success': True,
                 'message': 'Email and password verification successful',
                 'user_id': user.id
             })
         else:
-            return JsonResponse({
+            _login_failed(attempts_key)
+            return OrjsonResponse({
                 'success': False,
                 'message': 'user credential invalid'
             })
                 
                 
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Invalid JSON data'
         }, status=400)
         
     except Exception as e:
-        logger.error(f"Unexpected error in email/password verification: {e}")
-        return JsonResponse({
+        logger.error("Unexpected error in email/password verification: %s", e, exc_info=True)
+        return OrjsonResponse({
             'success': False,
             'error': 'Internal server error'
         }, status=500)
 
 
+# Columns returned for each user by get_all_users, with id first for the cursor
+USER_LIST_FIELDS = ('id', 'email', 'is_active', 'is_staff', 'date_joined')
+
+# Rows per get_all_users page by default and at most, and rows per streamed block
+USERS_PAGE_SIZE = 1000
+USERS_MAX_PAGE_SIZE = 10000
+USERS_STREAM_BLOCK = 500
+
+def _stream_users(rows, limit, columnar=False):
+    """
+    Yield the get_all_users JSON body a block of rows at a time, so neither the
+    row dicts nor the full document are ever held in memory at once.
+    columnar lists the field names once and each user as an array of values.
+    """
+    if columnar:
+        yield b'{"success":true,"columns":' + dumps(USER_LIST_FIELDS) + b',"rows":['
+    else:
+        yield b'{"success":true,"users":['
+    count = 0
+    last_id = None
+    block = []
+    for row in rows:
+        block.append(dumps(row) if columnar else dumps(dict(zip(USER_LIST_FIELDS, row))))
+        last_id = row[0]
+        count += 1
+        if len(block) == USERS_STREAM_BLOCK:
+            yield (b',' if count > len(block) else b'') + b','.join(block)
+            block = []
+    if block:
+        yield (b',' if count > len(block) else b'') + b','.join(block)
+    # A full page means there may be more rows after the last id
+    next_cursor = last_id if count == limit else None
+    yield b'],"next_cursor":' + dumps(next_cursor) + b'}'
+
 @require_http_methods(["GET"])
 def get_all_users(request):
+    """
+    GET ?cursor=<last id seen>&limit=<rows>&format=columns
+    Streams users ordered by id, starting after cursor; pass the returned
+    next_cursor back to get the following page (null when there is none).
+    format=columns returns { columns, rows } instead of a list of user objects.
+    """
     try:
-        users = User.objects.all().values('id', 'email', 'is_active', 'is_staff', 'date_joined')
-        users_list = list(users)
-        return JsonResponse({
-            'success': True,
-            'users': users_list
-        })
+        try:
+            cursor = int(request.GET.get('cursor', 0))
+            limit = int(request.GET.get('limit', USERS_PAGE_SIZE))
+            if cursor < 0 or limit < 1 or limit > USERS_MAX_PAGE_SIZE:
+                raise ValueError(limit)
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': f'cursor must be a non-negative integer and limit between 1 and {USERS_MAX_PAGE_SIZE}'
+            }, status=400)
+        columnar = request.GET.get('format') == 'columns'
+        
+        # Keyset page over the primary key index; rows come straight from the driver
+        users = (
+            User.objects.filter(id__gt=cursor)
+            .order_by('id')
+            .values_list(*USER_LIST_FIELDS)[:limit]
+        )
+        return StreamingHttpResponse(
+            _stream_users(users.iterator(chunk_size=2000), limit, columnar),
+            content_type='application/json'
+        )
     except Exception as e:
         logger.error(f"Unexpected error in fetching all users: {e}")
         return JsonResponse({
@@ -262,6 +620,40 @@ def get_all_users(request):
 
 
 
+def _validate_registration(data):
+    """
+    Extract and check the registration fields in one pass.
+    Returns (cleaned, errors); errors is empty when the data can be saved.
+    """
+    name = data.get('name', '').strip()
+    email = _normalize_email(data.get('email', ''))
+    password = data.get('password', '')
+    cleaned = {
+        'name': name,
+        'email': email,
+        'password': password,
+        'coren': data.get('coren', '').strip(),
+        'specialty': data.get('specialty', '').strip(),
+    }
+
+    errors = {}
+    if not name:
+        errors['name'] = [_ERR_NAME_REQUIRED]
+    if not email:
+        errors['email'] = [_ERR_EMAIL_REQUIRED]
+    if not password:
+        errors['password'] = [_ERR_PASSWORD_REQUIRED]
+    # Specialty is only reported next to another missing field, as before
+    if errors and not cleaned['specialty']:
+        errors['specialty'] = [_ERR_SPECIALTY_REQUIRED]
+
+    # Format and strength checks are disabled for now; when re-enabled they go
+    # here, after the cheap checks and before anything touches the database:
+    #   email_valid, email_error, email = validate_email_format(email, already_normalized=True)
+    #   password_valid, password_error = validate_password_strength(password)
+    return cleaned, errors
+
+
 @extend_schema(
     tags=["Auth"],
     summary="Register a new user",
@@ -284,85 +676,53 @@ def register_user(request):
     Response: 201 Created, { id, name, email }
     """
     try:
-        data = json.loads(request.body)
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip().lower()
-        password = data.get('password', '')
-        coren = data.get('coren', '').strip()
-        specialty = data.get('specialty', '').strip()
-        
-        # Validate required fields
-        if not name or not email or not password:
-            errors = {}
-            if not name:
-                errors['name'] = ['Name is required']
-            if not email:
-                errors['email'] = ['Email is required']
-            if not password:
-                errors['password'] = ['Password is required']
-            if not specialty:
-                errors['specialty'] = ['Specialty is required']
-            
-            return JsonResponse({
+        data = json_loads(request.body)
+        cleaned, errors = _validate_registration(data)
+        if errors:
+            return OrjsonResponse({
                 'message': 'Validation failed',
                 'errors': errors
             }, status=400)
-        # Validate email format
-        #email_valid, email_error = validate_email_format(email)
-        '''
-        if not email_valid:
-            return JsonResponse({
-                'message': 'Validation failed',
-                'errors': {
-                    'email': [email_error]
-                }
-            }, status=400)
-        '''
-        
-        '''
-        # Validate password strength
-        password_valid, password_error = validate_password_strength(password)
-        if not password_valid:
-            return JsonResponse({
-                'message': 'Validation failed',
-                'errors': {
-                    'password': [password_error]
-                }
-            }, status=400)
-        '''
-        
-        # Check if user already exists
-        if User.objects.filter(email=email).exists():
-            return JsonResponse({
+        name = cleaned['name']
+        email = cleaned['email']
+        password = cleaned['password']
+        coren = cleaned['coren']
+
+        # Create new user; the case-insensitive unique constraint on email rejects
+        # duplicates, so there is no separate existence check to race with
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=email,
+                    password=password,
+                    name=name,
+                    coren=coren if coren else None,
+                )
+        except IntegrityError:
+            return OrjsonResponse({
                 'message': 'Validation failed',
                 'errors': {
                     'email': ['User with this email already exists']
                 }
             }, status=400)
-        
-        # Create new user
-        user = User.objects.create_user(
-            email=email,
-            password=password,
-            name=name,
-            coren=coren if coren else None,
-        )
+        cache.delete(_auth_miss_key(email))
+        forget_token_user(user.id)
         
         logger.info(f"New user registered: {name} ({email})")
         
-        return JsonResponse({
+        return OrjsonResponse({
             'id': user.id,
             'name': user.name,
             'email': user.email
         }, status=201)
         
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
         logger.error(f"Unexpected error in user registration: {e}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Internal server error'
         }, status=500)
@@ -390,51 +750,64 @@ def login_user(request):
     Response: 200 OK, { token, user: { id, name, email } }
     """
     try:
-        data = json.loads(request.body)
-        email = data.get('email', '').strip().lower()
+        data = json_loads(request.body)
+        email = _normalize_email(data.get('email', ''))
         password = data.get('password', '')
         
         print(data)
         
         if not email or not password:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'Validation failed',
                 'errors': {
-                    'email': ['Email is required'] if not email else [],
-                    'password': ['Password is required'] if not password else []
+                    'email': [_ERR_EMAIL_REQUIRED] if not email else [],
+                    'password': [_ERR_PASSWORD_REQUIRED] if not password else []
                 }
             }, status=400)
         
+        attempts_key = _login_attempts_key(request, email)
+        if _login_rate_limited(attempts_key):
+            return _too_many_attempts({
+                'message': 'Too many login attempts, try again later'
+            })
+        
         # Check if user exists and verify password
         try:
-            user = User.objects.get(email=email)
+            user = User.objects.only(
+                'id', 'name', 'email', 'is_active', 'password', 'last_login'
+            ).get(email=email)
         except User.DoesNotExist:
-            return JsonResponse({
+            _login_failed(attempts_key)
+            return OrjsonResponse({
                 'message': 'Invalid credentials'
             }, status=401)
         
         # Check if user is active
         if not user.is_active:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'User account is disabled'
             }, status=401)
         
         # Verify password
         if not user.check_password(password):
-            return JsonResponse({
+            _login_failed(attempts_key)
+            return OrjsonResponse({
                 'message': 'Invalid credentials'
             }, status=401)
+        _login_succeeded(attempts_key)
         
         # Generate JWT token (only access token as per spec)
         access_token, _ = generate_jwt_tokens(user)
         
-        # Update last login
-        user.last_login = timezone.now()
-        user.save(update_fields=['last_login'])
+        # Update last login, skipping the write when the stored value is still fresh
+        now = timezone.now()
+        if user.last_login is None or now - user.last_login >= LAST_LOGIN_UPDATE_INTERVAL:
+            User.objects.filter(pk=user.pk).update(last_login=now)
+        forget_token_user(user.id)
         
         logger.info(f"User logged in: {user.name} ({email})")
         
-        return JsonResponse({
+        return OrjsonResponse({
             'token': access_token,
             'user': {
                 'id': user.id,
@@ -444,12 +817,12 @@ def login_user(request):
         }, status=200)
         
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
         logger.error(f"Unexpected error in user login: {e}")
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Internal server error'
         }, status=500)
 
@@ -475,11 +848,11 @@ def verify_token(request):
     Expected JSON: {"token": "jwt_token_here"}
     """
     try:
-        data = json.loads(request.body)
+        data = json_loads(request.body)
         token = data.get('token', '')
         
         if not token:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'Token is required'
             }, status=400)
         
@@ -487,34 +860,29 @@ def verify_token(request):
         user_id, error = verify_jwt_token(token)
         
         if error:
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': error
             }, status=401)
         
         # Get user info
-        try:
-            user = User.objects.get(id=user_id)
-            return JsonResponse({
-                'message': 'Token is valid',
-                'user': {
-                    'id': user.id,
-                    'email': user.email,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name
-                }
-            }, status=200)
-        except User.DoesNotExist:
-            return JsonResponse({
+        user_data = get_token_user(user_id)
+        if user_data is None:
+            return OrjsonResponse({
                 'message': 'User not found'
             }, status=401)
         
+        return OrjsonResponse({
+            'message': 'Token is valid',
+            'user': user_data
+        }, status=200)
+        
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
         logger.error(f"Unexpected error in token verification: {e}")
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Internal server error'
         }, status=500)
 